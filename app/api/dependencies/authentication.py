@@ -22,9 +22,11 @@ from app.core.config import get_app_settings
 from app.core.settings.app import AppSettings
 from app.database.repositories.user_repository import UserRepository
 from app.models.domain.user import UserInDB
+from app.models.schemas.jwt import JWTAccess
 from app.resources import strings_factory
 from app.services.auth_token_header import AuthTokenHeader
-from app.services.token import get_user_id_from_access_token
+from app.services.revocation import revocation_list
+from app.services.token import get_access_token_payload
 
 
 HEADER_KEY = "Authorization"
@@ -34,6 +36,10 @@ def get_current_user_authorizer() -> Callable:
     return _get_current_user
 
 
+def get_token_payload_authorizer() -> Callable:
+    return _get_token_payload
+
+
 def _get_authorization_header(
         language: str = Depends(get_language),
         auth_token: str = Security(AuthTokenHeader(name=HEADER_KEY)),
@@ -53,30 +59,41 @@ def _get_authorization_header(
     return token
 
 
-def _get_user_id_from_token(
+def _get_token_payload(
         language: str = Depends(get_language),
         token: str = Depends(_get_authorization_header),
         settings: AppSettings = Depends(get_app_settings),
-) -> int:
+) -> JWTAccess:
     strings = strings_factory.get_language(language)
 
-    user_id = get_user_id_from_access_token(token, settings.public_key)
-    if not user_id:
+    payload = get_access_token_payload(token, settings.public_key)
+    if not payload:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, strings.MALFORMED_PAYLOAD)
 
-    return user_id
+    if revocation_list.is_revoked(payload.user_id, payload.issued_at, payload.jti):
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, strings.ACCESS_TOKEN_IS_REVOKED)
+
+    return payload
 
 
 async def _get_current_user(
         language: str = Depends(get_language),
-        user_id: int = Depends(_get_user_id_from_token),
-        user_repository: UserRepository = Depends(get_repository(UserRepository))
+        payload: JWTAccess = Depends(_get_token_payload),
+        user_repository: UserRepository = Depends(get_repository(UserRepository)),
+        settings: AppSettings = Depends(get_app_settings),
 ) -> UserInDB:
     strings = strings_factory.get_language(language)
 
-    user = await user_repository.get_user_by_id(user_id)
+    if settings.jwt_claims_only and payload.profile:
+        user = UserInDB(id=payload.user_id, username=payload.username, **payload.profile.__dict__)
+    else:
+        user = await user_repository.get_user_by_id(payload.user_id)
+
     if not user:
-        logger.error(f"User (id: {user_id}) doesn't exist")
+        logger.error(f"User (id: {payload.user_id}) doesn't exist")
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, strings.USER_DOES_NOT_EXIST_ERROR)
 
+    if user.is_blocked:
+        raise HTTPException(status.HTTP_403_FORBIDDEN, strings.USER_IS_BLOCKED)
+
     return user
@@ -18,7 +18,11 @@ from fastapi import Depends
 from fastapi.requests import Request
 from neo4j import AsyncSession
 
+from app.core.config import get_app_settings
+from app.core.settings.app import AppSettings
+from app.database.key_value_store import KeyValueStore, get_key_value_store
 from app.database.repositories.base_repository import BaseRepository
+from app.database.repositories.verification_code_repository import VerificationCodeRepository
 
 
 def _get_db_session(request: Request) -> AsyncSession:
@@ -30,3 +34,11 @@ def get_repository(repo_type: Type[BaseRepository]) -> Callable[[AsyncSession],
         return repo_type(session)
 
     return _get_repo
+
+
+def _get_key_value_store(settings: AppSettings = Depends(get_app_settings)) -> KeyValueStore:
+    return get_key_value_store(settings.redis_url)
+
+
+def get_verification_code_repository(store: KeyValueStore = Depends(_get_key_value_store)) -> VerificationCodeRepository:
+    return VerificationCodeRepository(store)
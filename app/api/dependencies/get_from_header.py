@@ -12,8 +12,15 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from fastapi import Header
+from fastapi import Header, Request
 
 
 def get_language(language: str = Header(default="en", alias="Accept-Language")) -> str:
     return language
+
+
+def get_client_host(request: Request) -> str:
+    if not request.client:
+        return ""
+
+    return request.client.host
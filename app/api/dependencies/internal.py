@@ -0,0 +1,45 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from hmac import compare_digest
+
+from fastapi import Depends, Header, HTTPException, status
+
+from app.api.dependencies.get_from_header import get_language
+from app.core.config import get_app_settings
+from app.core.settings.app import AppSettings
+from app.resources import strings_factory
+
+HEADER_KEY = "X-Internal-Api-Key"
+PROFILING_HEADER_KEY = "X-Profiling-Key"
+
+
+def check_internal_api_key(
+        language: str = Depends(get_language),
+        api_key: str = Header(default="", alias=HEADER_KEY),
+        settings: AppSettings = Depends(get_app_settings),
+) -> None:
+    if not settings.internal_api_key or not compare_digest(api_key.encode(), settings.internal_api_key.encode()):
+        strings = strings_factory.get_language(language)
+        raise HTTPException(status.HTTP_403_FORBIDDEN, strings.INTERNAL_API_KEY_IS_WRONG)
+
+
+def check_profiling_key(
+        language: str = Depends(get_language),
+        profiling_key: str = Header(default="", alias=PROFILING_HEADER_KEY),
+        settings: AppSettings = Depends(get_app_settings),
+) -> None:
+    if not settings.profiling_key or not compare_digest(profiling_key.encode(), settings.profiling_key.encode()):
+        strings = strings_factory.get_language(language)
+        raise HTTPException(status.HTTP_403_FORBIDDEN, strings.PROFILING_KEY_IS_WRONG)
@@ -0,0 +1,36 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from fastapi import Depends
+
+from app.core.config import get_app_settings
+from app.core.settings.app import AppSettings
+from app.services import rate_limit
+
+
+def get_login_limiter(settings: AppSettings = Depends(get_app_settings)) -> rate_limit.LoginLimiter:
+    return rate_limit.get_login_limiter(
+        settings.login_attempts_per_username,
+        settings.login_attempts_per_host,
+        settings.login_attempts_window,
+        settings.redis_url,
+    )
+
+
+def get_verification_code_limiter(settings: AppSettings = Depends(get_app_settings)) -> rate_limit.VerificationCodeLimiter:
+    return rate_limit.get_verification_code_limiter(
+        settings.verification_code_resend_timeout,
+        settings.verification_codes_per_day,
+        settings.redis_url,
+    )
@@ -12,15 +12,36 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from typing import Any, Dict
+
+import orjson
+
 from fastapi import HTTPException
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
+
+from app.resources import strings_factory
+
+
+def _render_error(message: Any) -> bytes:
+    return orjson.dumps({"success": False, "payload": None, "message": message})
+
+
+ERROR_BODIES: Dict[str, bytes] = {
+    message: _render_error(message)
+    for strings in strings_factory.LANGUAGES.values()
+    for message in strings_factory.get_messages(strings)
+}
 
-from app.models.schemas.wrapper import WrapperResponse
 
+async def http_error_handler(_: Request, exc: HTTPException) -> Response:
+    body = ERROR_BODIES.get(exc.detail) if isinstance(exc.detail, str) else None
+    if body is None:
+        body = _render_error(exc.detail)
 
-async def http_error_handler(_: Request, exc: HTTPException) -> JSONResponse:
-    return JSONResponse(
-        content=WrapperResponse(success=False, message=exc.detail).model_dump(),
-        status_code=exc.status_code
+    return Response(
+        content=body,
+        status_code=exc.status_code,
+        headers=exc.headers,
+        media_type="application/json",
     )
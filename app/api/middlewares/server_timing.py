@@ -0,0 +1,62 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from hmac import compare_digest
+from time import perf_counter
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.timing import format_server_timing, start_timing
+
+SERVER_TIMING_HEADER = b"x-server-timing"
+
+
+class ServerTimingMiddleware(object):
+    def __init__(self, app: ASGIApp, enabled: bool, key: str) -> None:
+        self.app = app
+        self.enabled = enabled
+        self.key = key.encode()
+
+    def _is_enabled(self, scope: Scope) -> bool:
+        if self.enabled:
+            return True
+
+        if not self.key:
+            return False
+
+        for name, value in scope["headers"]:
+            if name == SERVER_TIMING_HEADER:
+                return compare_digest(value, self.key)
+
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._is_enabled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        phases = start_timing()
+        started = perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                phases["total"] = perf_counter() - started
+
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", format_server_timing(phases))
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
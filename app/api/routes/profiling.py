@@ -0,0 +1,68 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import PlainTextResponse
+
+from app.api.dependencies.get_from_header import get_language
+from app.api.dependencies.internal import check_profiling_key
+from app.resources import strings_factory
+from app.services.profiler import MemoryTracingNotStarted, ProfilerBusy, memory_tracer, sampling_profiler
+
+router = APIRouter(prefix="/debug", dependencies=[Depends(check_profiling_key)])
+
+
+@router.get("/profile", include_in_schema=False, name="profiling:cpu")
+async def get_cpu_profile(
+        seconds: float = Query(default=10.0, gt=0, le=60),
+        interval: float = Query(default=0.01, ge=0.001, le=1),
+        language: str = Depends(get_language),
+) -> PlainTextResponse:
+    strings = strings_factory.get_language(language)
+
+    try:
+        stacks = await asyncio.to_thread(sampling_profiler.profile, seconds, interval)
+    except ProfilerBusy:
+        raise HTTPException(status.HTTP_409_CONFLICT, strings.PROFILER_IS_BUSY)
+
+    return PlainTextResponse(stacks)
+
+
+@router.post("/memory/start", include_in_schema=False, name="profiling:memory-start")
+async def start_memory_tracing(frames: int = Query(default=10, ge=1, le=100)) -> Response:
+    await asyncio.to_thread(memory_tracer.start, frames)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/memory", include_in_schema=False, name="profiling:memory")
+async def get_memory_growth(
+        limit: int = Query(default=20, ge=1, le=1000),
+        language: str = Depends(get_language),
+) -> PlainTextResponse:
+    strings = strings_factory.get_language(language)
+
+    try:
+        report = await asyncio.to_thread(memory_tracer.diff, limit)
+    except MemoryTracingNotStarted:
+        raise HTTPException(status.HTTP_409_CONFLICT, strings.MEMORY_TRACING_IS_NOT_STARTED)
+
+    return PlainTextResponse(report)
+
+
+@router.post("/memory/stop", include_in_schema=False, name="profiling:memory-stop")
+async def stop_memory_tracing() -> Response:
+    await asyncio.to_thread(memory_tracer.stop)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
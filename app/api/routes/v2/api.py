@@ -14,10 +14,11 @@
 
 from fastapi import APIRouter
 
-from app.api.routes.v2 import auth, user, exist
+from app.api.routes.v2 import auth, user, exist, token
 
 router = APIRouter(prefix="/v2")
 
 router.include_router(auth.router, tags=["Auth"])
 router.include_router(user.router, tags=["Users"], prefix="/users")
 router.include_router(exist.router, tags=["Exists"], prefix="/exists")
+router.include_router(token.router, tags=["Tokens"], prefix="/tokens")
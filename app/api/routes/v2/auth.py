@@ -12,61 +12,96 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from math import ceil
 
-from app.api.dependencies.database import get_repository
-from app.api.dependencies.get_from_header import get_language
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from app.api.dependencies.authentication import HEADER_KEY, get_token_payload_authorizer
+from app.api.dependencies.database import get_repository, get_verification_code_repository
+from app.api.dependencies.get_from_header import get_client_host, get_language
+from app.api.dependencies.rate_limit import get_login_limiter, get_verification_code_limiter
+from app.api.dependencies.sms import get_sms_outbox
+from app.api.routes.timed_route import TimedRoute
 from app.core.config import get_app_settings
 from app.core.settings.app import AppSettings
 from app.database.repositories.phone_repository import PhoneRepository
+from app.database.repositories.revocation_repository import RevocationRepository
+from app.database.repositories.sms_outbox_repository import SmsOutboxRepository
 from app.database.repositories.token_repository import TokenRepository
 from app.database.repositories.user_repository import UserRepository
+from app.database.repositories.verification_code_repository import VerificationCodeRepository
 from app.models.domain.user import User
 from app.models.domain.verification_code import VerificationCode
+from app.models.schemas.jwt import JWTAccess
 from app.models.schemas.phone import Phone, PhoneTokenResponse
 from app.models.schemas.user import UserCreate, UserLogin, UserWithTokenResponse, Token, UserChangePassword
 from app.models.schemas.wrapper import WrapperResponse
+from app.services.circuit_breaker import CircuitState
+from app.services.forward_auth import get_forward_auth_headers
+from app.services.rate_limit import LoginLimiter, RateLimitStoreUnavailable, VerificationCodeLimiter
+from app.services.revocation import revoke_token, revoke_user
 from app.services.token import create_tokens_for_user, get_user_id_from_refresh_token
-from app.services.validate import check_phone_is_valid
-from app.services.sms import send_verify_code_to_phone
+from app.services.validate import normalize_phone
+from app.services.sms_outbox import SmsOutbox
 from app.resources import strings_factory
-from app.services.verification_code import create_verification_code, check_verification_code
+from app.services.verification_code import (
+    check_verification_code,
+    check_verification_code_is_active,
+    create_verification_code,
+    verification_code_lock,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/get_verification_code", status_code=status.HTTP_200_OK, name="auth:verification")
 async def get_verification_code(
         request: Phone,
         language: str = Depends(get_language),
-        phone_repository: PhoneRepository = Depends(get_repository(PhoneRepository)),
+        verification_code_limiter: VerificationCodeLimiter = Depends(get_verification_code_limiter),
+        verification_code_repository: VerificationCodeRepository = Depends(get_verification_code_repository),
+        sms_outbox: SmsOutbox = Depends(get_sms_outbox),
+        sms_outbox_repository: SmsOutboxRepository = Depends(get_repository(SmsOutboxRepository)),
         settings: AppSettings = Depends(get_app_settings),
-) -> WrapperResponse:
+) -> WrapperResponse[PhoneTokenResponse]:
     async def generate_verification_code(phone: str) -> VerificationCode:
         verification: VerificationCode = create_verification_code(settings.verification_code_timeout)
         verification_message_template = strings.VERIFICATION_CODE_TEMPLATE
         verification_message = verification_message_template.format(code=verification.code)
 
-        await phone_repository.update_verification_code_by_phone(phone, verification.secret, verification.token, verification.code)
-
-        if not await send_verify_code_to_phone(settings.sms_service, phone, verification_message):
-            raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, strings.SEND_SMS_ERROR)
+        await verification_code_repository.update_verification_code_by_phone(phone, verification)
+        await sms_outbox.enqueue(sms_outbox_repository, verification.token, phone, verification_message, verification.expires_at)
 
         return verification
 
     strings = strings_factory.get_language(language)
 
-    if not check_phone_is_valid(request.phone):
+    phone = normalize_phone(request.phone, settings.phone_regions)
+    if not phone:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.PHONE_NUMBER_INVALID_ERROR)
 
-    verification_code: VerificationCode | None = await phone_repository.get_verification_code_by_phone(request.phone)
-    if not verification_code:
-        verification_code = await generate_verification_code(request.phone)
+    async with verification_code_lock(phone):
+        verification_code: VerificationCode | None = await verification_code_repository.get_verification_code_by_phone(phone)
+
+        if not verification_code or not check_verification_code_is_active(verification_code):
+            if sms_outbox.breaker.state == CircuitState.open:
+                raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, strings.SEND_SMS_ERROR)
+
+            try:
+                retry_after = await verification_code_limiter.acquire(phone)
+            except RateLimitStoreUnavailable:
+                raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, strings.SEND_SMS_ERROR)
 
-    if not check_verification_code(verification_code.secret, verification_code.token, verification_code.code, settings.verification_code_timeout):
-        verification_code = await generate_verification_code(request.phone)
+            if retry_after:
+                raise HTTPException(
+                    status.HTTP_429_TOO_MANY_REQUESTS,
+                    strings.VERIFICATION_CODE_TOO_MANY_REQUESTS,
+                    headers={"Retry-After": str(ceil(retry_after))},
+                )
 
-    return WrapperResponse(
+            verification_code = await generate_verification_code(phone)
+
+    return WrapperResponse[PhoneTokenResponse](
         payload=PhoneTokenResponse(verification_token=verification_code.token)
     )
 
@@ -78,30 +113,37 @@ async def register(
         user_repository: UserRepository = Depends(get_repository(UserRepository)),
         phone_repository: PhoneRepository = Depends(get_repository(PhoneRepository)),
         token_repository: TokenRepository = Depends(get_repository(TokenRepository)),
+        verification_code_repository: VerificationCodeRepository = Depends(get_verification_code_repository),
         settings: AppSettings = Depends(get_app_settings),
-) -> WrapperResponse:
+) -> WrapperResponse[UserWithTokenResponse]:
     strings = strings_factory.get_language(language)
 
-    verification_code: VerificationCode = await phone_repository.get_verification_code_by_phone(request.phone)
+    phone = normalize_phone(request.phone, settings.phone_regions)
+    if not phone:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.PHONE_NUMBER_INVALID_ERROR)
+
+    verification_code: VerificationCode = await verification_code_repository.get_verification_code_by_phone(phone)
     if not verification_code:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.VERIFICATION_CODE_DOES_NOT_EXISTS)
 
-    if not check_verification_code(verification_code.secret, request.verification_token, request.verification_code, settings.verification_code_timeout):
+    if not check_verification_code(verification_code, request.verification_token, request.verification_code):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.VERIFICATION_CODE_IS_WRONG)
 
-    if await phone_repository.is_attached_by_phone(request.phone):
+    if await phone_repository.is_attached_by_phone(phone):
         raise HTTPException(status.HTTP_409_CONFLICT, strings.PHONE_NUMBER_TAKEN)
 
     if await user_repository.is_exists(request.username):
         raise HTTPException(status.HTTP_409_CONFLICT, strings.USERNAME_TAKEN)
 
-    user = await user_repository.create_user(**request.model_dump())
+    user = await user_repository.create_user(**request.model_dump(exclude={"phone"}), phone=phone)
     if user:
-        token_access, token_refresh = create_tokens_for_user(user.id, user.username, settings.private_key)
+        await verification_code_repository.delete_verification_code_by_phone(phone)
+
+        token_access, token_refresh = create_tokens_for_user(user.id, user.username, settings.private_key, user if settings.jwt_claims_only else None)
 
         await token_repository.update_token(user.id, token_refresh)
 
-        return WrapperResponse(
+        return WrapperResponse[UserWithTokenResponse](
             payload=UserWithTokenResponse(
                 user=user,
                 token=Token(token_access=token_access, token_refresh=token_refresh)
@@ -115,12 +157,22 @@ async def register(
 async def login(
         request: UserLogin,
         language: str = Depends(get_language),
+        client_host: str = Depends(get_client_host),
+        login_limiter: LoginLimiter = Depends(get_login_limiter),
         user_repository: UserRepository = Depends(get_repository(UserRepository)),
         token_repository: TokenRepository = Depends(get_repository(TokenRepository)),
         settings: AppSettings = Depends(get_app_settings),
-) -> WrapperResponse:
+) -> WrapperResponse[UserWithTokenResponse]:
     strings = strings_factory.get_language(language)
 
+    retry_after = await login_limiter.acquire(request.username, client_host)
+    if retry_after:
+        raise HTTPException(
+            status.HTTP_429_TOO_MANY_REQUESTS,
+            strings.TOO_MANY_LOGIN_ATTEMPTS,
+            headers={"Retry-After": str(ceil(retry_after))},
+        )
+
     user = await user_repository.get_user_by_username(request.username)
 
     if not user:
@@ -129,11 +181,11 @@ async def login(
     if not user.check_password(request.password):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.INCORRECT_LOGIN_INPUT)
 
-    token_access, token_refresh = create_tokens_for_user(user.id, user.username, settings.private_key)
+    token_access, token_refresh = create_tokens_for_user(user.id, user.username, settings.private_key, user if settings.jwt_claims_only else None)
 
     await token_repository.update_token(user.id, token_refresh)
 
-    return WrapperResponse(
+    return WrapperResponse[UserWithTokenResponse](
         payload=UserWithTokenResponse(
             user=user,
             token=Token(token_access=token_access, token_refresh=token_refresh)
@@ -147,21 +199,27 @@ async def change_password(
         language: str = Depends(get_language),
         user_repository: UserRepository = Depends(get_repository(UserRepository)),
         phone_repository: PhoneRepository = Depends(get_repository(PhoneRepository)),
+        revocation_repository: RevocationRepository = Depends(get_repository(RevocationRepository)),
+        verification_code_repository: VerificationCodeRepository = Depends(get_verification_code_repository),
         settings: AppSettings = Depends(get_app_settings),
-) -> WrapperResponse:
+) -> WrapperResponse[UserWithTokenResponse]:
     strings = strings_factory.get_language(language)
 
-    verification_code = await phone_repository.get_verification_code_by_phone(request.phone)
+    phone = normalize_phone(request.phone, settings.phone_regions)
+    if not phone:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.PHONE_NUMBER_INVALID_ERROR)
+
+    verification_code = await verification_code_repository.get_verification_code_by_phone(phone)
     if not verification_code:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.VERIFICATION_CODE_IS_WRONG)
 
-    if not check_verification_code(verification_code.secret, request.verification_token, request.verification_code, settings.verification_code_timeout):
+    if not check_verification_code(verification_code, request.verification_token, request.verification_code):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.VERIFICATION_CODE_IS_WRONG)
 
-    if not await phone_repository.is_attached_by_phone(request.phone):
+    if not await phone_repository.is_attached_by_phone(phone):
         raise HTTPException(status.HTTP_404_NOT_FOUND, strings.PHONE_NUMBER_DOES_NOT_EXIST)
 
-    user = await user_repository.get_user_by_phone(request.phone)
+    user = await user_repository.get_user_by_phone(phone)
     if not user:
         raise HTTPException(status.HTTP_404_NOT_FOUND, strings.USER_DOES_NOT_EXIST_ERROR)
 
@@ -169,9 +227,12 @@ async def change_password(
     if not user:
         raise HTTPException(status.HTTP_404_NOT_FOUND, strings.USER_DOES_NOT_EXIST_ERROR)
 
-    token_access, token_refresh = create_tokens_for_user(user.id, user.username, settings.private_key)
+    await verification_code_repository.delete_verification_code_by_phone(phone)
+    await revoke_user(revocation_repository, user.id)
+
+    token_access, token_refresh = create_tokens_for_user(user.id, user.username, settings.private_key, user if settings.jwt_claims_only else None)
 
-    return WrapperResponse(
+    return WrapperResponse[UserWithTokenResponse](
         payload=UserWithTokenResponse(
             user=user,
             token=Token(token_access=token_access, token_refresh=token_refresh)
@@ -186,7 +247,7 @@ async def refresh_token(
         user_repository: UserRepository = Depends(get_repository(UserRepository)),
         token_repository: TokenRepository = Depends(get_repository(TokenRepository)),
         settings: AppSettings = Depends(get_app_settings),
-) -> WrapperResponse:
+) -> WrapperResponse[UserWithTokenResponse]:
     strings = strings_factory.get_language(language)
 
     user_id = get_user_id_from_refresh_token(request.token_access, request.token_refresh, settings.public_key)
@@ -202,13 +263,41 @@ async def refresh_token(
     if not user:
         raise HTTPException(status.HTTP_404_NOT_FOUND, strings.USER_DOES_NOT_EXIST_ERROR)
 
-    token_access, token_refresh = create_tokens_for_user(user.id, user.username, settings.private_key)
+    token_access, token_refresh = create_tokens_for_user(user.id, user.username, settings.private_key, user if settings.jwt_claims_only else None)
 
     await token_repository.update_token(user.id, token_refresh)
 
-    return WrapperResponse(
+    return WrapperResponse[UserWithTokenResponse](
         payload=UserWithTokenResponse(
             user=user,
             token=Token(token_access=token_access, token_refresh=token_refresh)
         )
     )
+
+
+@router.post("/logout", status_code=status.HTTP_200_OK, name="auth:logout")
+async def logout(
+        payload: JWTAccess = Depends(get_token_payload_authorizer()),
+        token_repository: TokenRepository = Depends(get_repository(TokenRepository)),
+        revocation_repository: RevocationRepository = Depends(get_repository(RevocationRepository)),
+) -> WrapperResponse[None]:
+    await revoke_token(revocation_repository, payload.jti, payload.exp)
+    await token_repository.update_token(payload.user_id, "")
+
+    return WrapperResponse[None]()
+
+
+@router.api_route(
+    "/forward_auth",
+    methods=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    status_code=status.HTTP_200_OK,
+    name="auth:forward-auth",
+)
+async def forward_auth(request: Request) -> Response:
+    settings = get_app_settings()
+
+    headers = get_forward_auth_headers(request.headers.get(HEADER_KEY), settings.jwt_token_prefix, settings.public_key)
+    if not headers:
+        return Response(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    return Response(status_code=status.HTTP_200_OK, headers=headers)
@@ -16,15 +16,18 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.api.dependencies.database import get_repository
 from app.api.dependencies.get_from_header import get_language
+from app.api.routes.timed_route import TimedRoute
+from app.core.config import get_app_settings
+from app.core.settings.app import AppSettings
 from app.database.repositories.phone_repository import PhoneRepository
 from app.database.repositories.user_repository import UserRepository
 from app.models.schemas.phone import Phone
 from app.models.schemas.user import Username
 from app.models.schemas.wrapper import WrapperResponse
-from app.services.validate import check_phone_is_valid
+from app.services.validate import normalize_phone
 from app.resources import strings_factory
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/username", status_code=status.HTTP_200_OK, name="exists:username")
@@ -32,13 +35,13 @@ async def exist_username(
         request: Username,
         language: str = Depends(get_language),
         user_repository: UserRepository = Depends(get_repository(UserRepository)),
-) -> WrapperResponse:
+) -> WrapperResponse[None]:
     strings = strings_factory.get_language(language)
 
     if not await user_repository.is_exists(request.username):
         raise HTTPException(status.HTTP_404_NOT_FOUND, strings.USERNAME_DOES_NOT_EXIST)
 
-    return WrapperResponse()
+    return WrapperResponse[None]()
 
 
 @router.post("/phone", status_code=status.HTTP_200_OK, name="exists:phone")
@@ -46,13 +49,15 @@ async def exist_phone(
         request: Phone,
         language: str = Depends(get_language),
         phone_repository: PhoneRepository = Depends(get_repository(PhoneRepository)),
-) -> WrapperResponse:
+        settings: AppSettings = Depends(get_app_settings),
+) -> WrapperResponse[None]:
     strings = strings_factory.get_language(language)
 
-    if not check_phone_is_valid(request.phone):
+    phone = normalize_phone(request.phone, settings.phone_regions)
+    if not phone:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.PHONE_NUMBER_INVALID_ERROR)
 
-    if not await phone_repository.is_attached_by_phone(request.phone):
+    if not await phone_repository.is_attached_by_phone(phone):
         raise HTTPException(status.HTTP_404_NOT_FOUND, strings.PHONE_NUMBER_DOES_NOT_EXIST)
 
-    return WrapperResponse()
+    return WrapperResponse[None]()
@@ -0,0 +1,71 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from fastapi import APIRouter, Depends, status
+
+from app.api.dependencies.database import get_repository
+from app.api.dependencies.internal import check_internal_api_key
+from app.api.routes.timed_route import TimedRoute
+from app.core.config import get_app_settings
+from app.core.settings.app import AppSettings
+from app.database.repositories.user_repository import UserRepository
+from app.models.schemas.introspection import TokensIntrospect, TokenIntrospection, TokensIntrospectResponse
+from app.models.schemas.wrapper import WrapperResponse
+from app.services.revocation import revocation_list
+from app.services.token import get_access_token_payload
+
+router = APIRouter(route_class=TimedRoute, dependencies=[Depends(check_internal_api_key)])
+
+
+@router.post("/introspect", status_code=status.HTTP_200_OK, name="tokens:introspect")
+async def introspect_tokens(
+        request: TokensIntrospect,
+        user_repository: UserRepository = Depends(get_repository(UserRepository)),
+        settings: AppSettings = Depends(get_app_settings),
+) -> WrapperResponse[TokensIntrospectResponse]:
+    payloads = []
+    for token in request.tokens:
+        payload = get_access_token_payload(token, settings.public_key)
+        if payload and revocation_list.is_revoked(payload.user_id, payload.issued_at, payload.jti):
+            payload = None
+
+        payloads.append(payload)
+
+    user_ids = list({payload.user_id for payload in payloads if payload})
+
+    blocked_by_user_id = {}
+    if user_ids:
+        blocked_by_user_id = await user_repository.get_blocked_state_by_user_ids(user_ids)
+
+    tokens = []
+    for payload in payloads:
+        if not payload or payload.user_id not in blocked_by_user_id:
+            tokens.append(TokenIntrospection())
+            continue
+
+        is_blocked = blocked_by_user_id[payload.user_id]
+
+        tokens.append(
+            TokenIntrospection(
+                active=not is_blocked,
+                user_id=payload.user_id,
+                username=payload.username,
+                expires_at=payload.exp,
+                is_blocked=is_blocked,
+            )
+        )
+
+    return WrapperResponse[TokensIntrospectResponse](
+        payload=TokensIntrospectResponse(tokens=tokens)
+    )
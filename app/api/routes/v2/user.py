@@ -15,36 +15,33 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.api.dependencies.authentication import get_current_user_authorizer
-from app.api.dependencies.database import get_repository
+from app.api.dependencies.database import get_repository, get_verification_code_repository
 from app.api.dependencies.get_from_path import get_user_id
 from app.api.dependencies.get_from_header import get_language
+from app.api.routes.timed_route import TimedRoute
 from app.core.config import get_app_settings
 from app.core.settings.app import AppSettings
 from app.database.repositories.phone_repository import PhoneRepository
+from app.database.repositories.revocation_repository import RevocationRepository
 from app.database.repositories.user_repository import UserRepository
+from app.database.repositories.verification_code_repository import VerificationCodeRepository
 from app.models.domain.user import User, UserInDB
 from app.models.domain.verification_code import VerificationCode
 from app.models.schemas.user import UserResponse, UserUpdate, UserChangePhone
 from app.models.schemas.wrapper import WrapperResponse
 from app.resources import strings_factory
+from app.services.revocation import revoke_user
+from app.services.validate import normalize_phone
 from app.services.verification_code import check_verification_code
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("", status_code=status.HTTP_200_OK, name="users:get-current-user")
 async def get_current_user(
-        language: str = Depends(get_language),
         user: User = Depends(get_current_user_authorizer()),
-        user_repository: UserRepository = Depends(get_repository(UserRepository)),
-) -> WrapperResponse:
-    strings = strings_factory.get_language(language)
-
-    user: User = await user_repository.get_user_by_username(user.username)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=strings.USER_DOES_NOT_EXIST_ERROR)
-
-    return WrapperResponse(
+) -> WrapperResponse[UserResponse]:
+    return WrapperResponse[UserResponse](
         payload=UserResponse(
             user=user,
         )
@@ -57,7 +54,9 @@ async def update_current_user(
         language: str = Depends(get_language),
         user: UserInDB = Depends(get_current_user_authorizer()),
         user_repository: UserRepository = Depends(get_repository(UserRepository)),
-) -> WrapperResponse:
+        revocation_repository: RevocationRepository = Depends(get_repository(RevocationRepository)),
+        settings: AppSettings = Depends(get_app_settings),
+) -> WrapperResponse[UserResponse]:
     strings = strings_factory.get_language(language)
 
     if request.username and request.username != user.username:
@@ -68,7 +67,11 @@ async def update_current_user(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=strings.USER_DOES_NOT_EXIST_ERROR)
 
-    return WrapperResponse(
+    # Tokens with profile claims would keep serving the old profile until they expire
+    if request.password or settings.jwt_claims_only:
+        await revoke_user(revocation_repository, user.id)
+
+    return WrapperResponse[UserResponse](
         payload=UserResponse(
             user=user,
         )
@@ -82,28 +85,39 @@ async def change_phone_for_current_user(
         user: UserInDB = Depends(get_current_user_authorizer()),
         user_repository: UserRepository = Depends(get_repository(UserRepository)),
         phone_repository: PhoneRepository = Depends(get_repository(PhoneRepository)),
+        revocation_repository: RevocationRepository = Depends(get_repository(RevocationRepository)),
+        verification_code_repository: VerificationCodeRepository = Depends(get_verification_code_repository),
         settings: AppSettings = Depends(get_app_settings),
-) -> WrapperResponse:
+) -> WrapperResponse[UserResponse]:
     strings = strings_factory.get_language(language)
 
-    verification_code: VerificationCode = await phone_repository.get_verification_code_by_phone(request.phone)
+    phone = normalize_phone(request.phone, settings.phone_regions)
+    if not phone:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.PHONE_NUMBER_INVALID_ERROR)
+
+    verification_code: VerificationCode = await verification_code_repository.get_verification_code_by_phone(phone)
     if not verification_code:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.VERIFICATION_CODE_IS_WRONG)
 
-    if not check_verification_code(verification_code.secret, request.verification_token, request.verification_code, settings.verification_code_timeout):
+    if not check_verification_code(verification_code, request.verification_token, request.verification_code):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, strings.VERIFICATION_CODE_IS_WRONG)
 
-    if request.phone == user.phone:
+    if phone == user.phone:
         raise HTTPException(status.HTTP_409_CONFLICT, strings.PHONE_NUMBER_TAKEN)
 
-    if await phone_repository.is_attached_by_phone(request.phone):
+    if await phone_repository.is_attached_by_phone(phone):
         raise HTTPException(status.HTTP_409_CONFLICT, strings.PHONE_NUMBER_TAKEN)
 
-    user: User = await user_repository.change_user_phone_by_user_id(user.id, phone=request.phone)
+    user: User = await user_repository.change_user_phone_by_user_id(user.id, phone=phone)
     if not user:
         raise HTTPException(status.HTTP_404_NOT_FOUND, strings.USER_DOES_NOT_EXIST_ERROR)
 
-    return WrapperResponse(
+    await verification_code_repository.delete_verification_code_by_phone(phone)
+
+    if settings.jwt_claims_only:
+        await revoke_user(revocation_repository, user.id)
+
+    return WrapperResponse[UserResponse](
         payload=UserResponse(
             user=user,
         )
@@ -115,14 +129,14 @@ async def get_user_by_id(
         user_id: int = Depends(get_user_id),
         language: str = Depends(get_language),
         user_repository: UserRepository = Depends(get_repository(UserRepository)),
-) -> WrapperResponse:
+) -> WrapperResponse[UserResponse]:
     strings = strings_factory.get_language(language)
 
     user = await user_repository.get_user_by_id(user_id)
     if not user:
         raise HTTPException(status.HTTP_404_NOT_FOUND, strings.USER_DOES_NOT_EXIST_ERROR)
 
-    return WrapperResponse(
+    return WrapperResponse[UserResponse](
         payload=UserResponse(
             user=user,
         )
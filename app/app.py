@@ -15,8 +15,14 @@
 from fastapi import FastAPI
 from fastapi.exceptions import HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.errors.http_error import http_error_handler
+from app.api.middlewares.metrics import MetricsMiddleware
+from app.api.middlewares.server_timing import ServerTimingMiddleware
+from app.api.middlewares.tracing import TracingMiddleware
+from app.api.routes.metrics import router as metrics_router
+from app.api.routes.profiling import router as profiling_router
 from app.api.routes.v2.api import router as api_router
 from app.core.config import get_app_settings
 from app.core.events import create_start_app_handler, create_stop_app_handler
@@ -26,7 +32,7 @@ def get_application() -> FastAPI:
     settings = get_app_settings()
     settings.configure_logging()
 
-    application = FastAPI(**settings.fastapi_kwargs)
+    application = FastAPI(default_response_class=ORJSONResponse, **settings.fastapi_kwargs)
 
     application.add_middleware(
         CORSMiddleware,
@@ -36,6 +42,15 @@ def get_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if settings.metrics_enabled:
+        application.add_middleware(MetricsMiddleware)
+
+    if settings.tracing_enabled:
+        application.add_middleware(TracingMiddleware)
+
+    if settings.server_timing_enabled or settings.server_timing_key:
+        application.add_middleware(ServerTimingMiddleware, enabled=settings.server_timing_enabled, key=settings.server_timing_key)
+
     application.add_event_handler(
         "startup",
         create_start_app_handler(application, settings),
@@ -50,6 +65,12 @@ def get_application() -> FastAPI:
 
     application.include_router(api_router, prefix=settings.api_prefix)
 
+    if settings.metrics_enabled:
+        application.include_router(metrics_router)
+
+    if settings.profiling_key:
+        application.include_router(profiling_router)
+
     return application
 
 
@@ -12,24 +12,98 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import asyncio
+
 from typing import Callable
 from fastapi import FastAPI
 from loguru import logger
 
+from app.core.monitoring import register_application_metrics
 from app.core.settings.app import AppSettings
+from app.core.tracing import SpanExporter, tracer
 from app.database.events import connect_to_db, close_db_connection
+from app.database.query_executor import query_profiler
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.loop_monitor import LoopMonitor
+from app.services.phone_sweeper import PhoneSweeper
+from app.services.revocation import sync_revocation_list
+from app.services.sms import create_sms_client
+from app.services.sms_outbox import SmsOutbox
 
 
 def create_start_app_handler(app: FastAPI, settings: AppSettings) -> Callable:
     async def start_app() -> None:
         await connect_to_db(app, settings)
 
+        query_profiler.configure(settings.slow_query_threshold, settings.slow_query_profile_rate, app.state.driver)
+
+        app.state.sms_client = create_sms_client(
+            settings.sms_service,
+            settings.sms_service_timeout,
+            settings.sms_service_connect_timeout,
+            settings.sms_service_max_connections,
+            settings.sms_service_max_keepalive_connections,
+            settings.sms_service_keepalive_expiry,
+            settings.sms_service_http2,
+        )
+
+        app.state.sms_outbox = SmsOutbox(
+            app.state.driver,
+            app.state.sms_client,
+            CircuitBreaker("sms_service", settings.sms_service_failure_threshold, settings.sms_service_recovery_timeout),
+            settings.sms_service_deadline,
+            settings.sms_outbox_workers,
+            settings.sms_outbox_batch_size,
+            settings.sms_outbox_poll_interval,
+            settings.sms_outbox_lease,
+            settings.sms_outbox_retry_base,
+            settings.sms_outbox_retry_max,
+        )
+
+        app.state.phone_sweeper = PhoneSweeper(
+            app.state.driver,
+            settings.phone_sweeper_interval,
+            settings.phone_sweeper_batch_size,
+            settings.phone_sweeper_batch_pause,
+        )
+
+        if settings.metrics_enabled:
+            register_application_metrics(app, settings)
+
+        app.state.background_tasks = [
+            asyncio.create_task(sync_revocation_list(app.state.driver, settings.revocation_sync_interval)),
+            asyncio.create_task(app.state.phone_sweeper.run()),
+            asyncio.create_task(app.state.sms_outbox.run()),
+        ]
+
+        if settings.loop_monitor_enabled:
+            app.state.loop_monitor = LoopMonitor(settings.loop_monitor_interval, settings.loop_monitor_threshold)
+            app.state.background_tasks.append(asyncio.create_task(app.state.loop_monitor.run()))
+
+        if settings.tracing_enabled:
+            tracer.configure(
+                settings.tracing_sample_rate,
+                SpanExporter(settings.tracing_file, settings.tracing_buffer_size),
+                settings.tracing_trust_traceparent,
+            )
+            app.state.background_tasks.append(asyncio.create_task(tracer.exporter.run(settings.tracing_flush_interval)))
+
     return start_app
 
 
 def create_stop_app_handler(app: FastAPI) -> Callable:
     @logger.catch
     async def stop_app() -> None:
+        for task in app.state.background_tasks:
+            task.cancel()
+
+        await app.state.sms_client.aclose()
+
+        if tracer.exporter:
+            await tracer.exporter.flush()
+
         await close_db_connection(app)
 
+        await logger.complete()
+
     return stop_app
@@ -12,28 +12,156 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import asyncio
 import logging
+import sys
+
+from queue import Full, Queue
+from random import random
+from threading import Thread
+from typing import Iterable, TextIO
+
+import orjson
 
-from types import FrameType
-from typing import cast
 from loguru import logger
 
+LEVEL_NAMES = frozenset(("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"))
+LOG_QUEUE_SIZE = 10000
+
+_queued_sink: "QueuedSink | None" = None
+
 
 class InterceptHandler(logging.Handler):
     def emit(self, record: logging.LogRecord) -> None:  # pragma: no cover
-        # Get corresponding Loguru level if it exists
+        # Standard levels exist in Loguru under the same names, others go by number
+        level = record.levelname if record.levelname in LEVEL_NAMES else record.levelno
+
+        # The stdlib record already knows its caller, so take it from there instead of walking frames
+        def patch_caller(message: dict) -> None:
+            message.update(name=record.name, function=record.funcName, line=record.lineno)
+
+        logger.opt(exception=record.exc_info).patch(patch_caller).log(level, record.getMessage())
+
+
+class AccessLogSampler(logging.Filter):
+    """Keeps a share of successful access log records and every error response."""
+
+    def __init__(self, sample_rate: float) -> None:
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn.access args are (client, method, path, http version, status code)
+        if isinstance(record.args, tuple) and len(record.args) == 5 and record.args[4] >= 400:
+            return True
+
+        return random() < self.sample_rate
+
+
+class QueuedSink(object):
+    """Hands log records to a writer thread that formats and writes them, so requests never wait on the stream.
+
+    The queue is bounded: while the stream stalls, records below WARNING such as access logs are dropped and
+    counted, and only warnings and errors wait for room.
+    """
+
+    def __init__(self, stream: TextIO, json: bool = False, queue_size: int = LOG_QUEUE_SIZE) -> None:
+        self._stream = stream
+        self._json = json
+        self._queue: Queue = Queue(queue_size)
+        self._thread = Thread(target=self._write, name="log-writer", daemon=True)
+        self._thread.start()
+
+        self.dropped = 0
+
+    def write(self, message: str) -> None:
+        if message.record["level"].no >= logging.WARNING:
+            self._queue.put(message)
+            return
+
         try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = str(record.levelno)
-
-        # Find caller from where originated the logged message
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:  # noqa: WPS609
-            frame = cast(FrameType, frame.f_back)
-            depth += 1
-
-        logger.opt(depth=depth, exception=record.exc_info).log(
-            level,
-            record.getMessage(),
-        )
+            self._queue.put_nowait(message)
+        except Full:
+            self.dropped += 1
+
+    def _write(self) -> None:
+        while True:
+            message = self._queue.get()
+
+            try:
+                if message is not None:
+                    self._stream.write(self._format(message))
+
+                if message is None or self._queue.empty():
+                    self._stream.flush()
+            except (OSError, ValueError):
+                # A closed or broken stream must not stop the thread, or the queue would grow forever
+                pass
+            finally:
+                self._queue.task_done()
+
+            if message is None:
+                return
+
+    def _format(self, message: str) -> str:
+        record = message.record
+        time = record["time"].isoformat(sep=" ", timespec="milliseconds")
+
+        if self._json:
+            return orjson.dumps({
+                "time": time,
+                "level": record["level"].name,
+                "name": record["name"],
+                "function": record["function"],
+                "line": record["line"],
+                "message": message.rstrip("\n"),
+                "extra": record["extra"],
+            }, default=str).decode() + "\n"
+
+        return f"{time} | {record['level'].name: <8} | {record['name']}:{record['function']}:{record['line']} - {message}"
+
+    async def complete(self) -> None:
+        await asyncio.to_thread(self._queue.join)
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+
+def get_dropped_log_records() -> int:
+    if _queued_sink is None:
+        return 0
+
+    return _queued_sink.dropped
+
+
+def configure_logging(
+        level: int,
+        loggers: Iterable[str],
+        json: bool = False,
+        enqueue: bool = False,
+        access_log_sample_rate: float = 1.0,
+        sink: TextIO | None = None,
+) -> None:
+    logging.getLogger().handlers = [InterceptHandler()]
+    for logger_name in loggers:
+        logging_logger = logging.getLogger(logger_name)
+        logging_logger.handlers = [InterceptHandler(level=level)]
+
+        if logger_name == "uvicorn.access" and access_log_sample_rate < 1.0:
+            logging_logger.filters = [AccessLogSampler(access_log_sample_rate)]
+
+    global _queued_sink
+
+    if sink is None:
+        sink = sys.stderr
+
+    if enqueue:
+        # Only the message is formatted in the request, the writer thread adds the rest
+        _queued_sink = QueuedSink(sink, json)
+        handler = {"sink": _queued_sink, "level": level, "format": "{message}", "colorize": False}
+    else:
+        _queued_sink = None
+        handler = {"sink": sink, "level": level, "serialize": json}
+
+    logger.configure(handlers=[handler])
@@ -0,0 +1,169 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+REGISTRY: Dict[str, "Metric"] = {}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    labels = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+
+    # Every worker keeps its own samples, the pid tells their series apart between scrapes
+    labels.append(f'worker="{os.getpid()}"')
+
+    return "{" + ",".join(labels) + "}"
+
+
+class Metric(ABC):
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+
+        REGISTRY[name] = self
+
+    @abstractmethod
+    def collect(self) -> List[str]:
+        ...
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self.collect(),
+        ]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, labels)} {value}" for labels, value in self._values.items()]
+
+
+class Histogram(Metric):
+    """Cumulative histogram; observations only touch plain lists, so recording needs no locks on the event loop."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labels)
+        self._buckets = buckets
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self._buckets) + 1) + [0.0]
+
+        series[bisect_left(self._buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self) -> List[str]:
+        lines: List[str] = []
+
+        for labels, series in self._series.items():
+            count = 0
+            for bucket, observations in zip((*self._buckets, "+Inf"), series):
+                count += observations
+                bucket_labels = _format_labels(self.labels, labels, f'le="{bucket}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {series[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {count}")
+
+        return lines
+
+
+class CallbackMetric(Metric):
+    """Counter or gauge whose samples are read from the owning object at scrape time."""
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            type: str,
+            labels: Tuple[str, ...] = (),
+            callback: Callable[[], Dict[LabelValues, float]] = dict,
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.type = type
+        self.callback = callback
+
+    def collect(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, labels)} {value}" for labels, value in self.callback().items()]
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY.values():
+        lines.extend(metric.render())
+
+    return "\n".join(lines) + "\n"
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route name.",
+    ("route", "method", "status"),
+)
+neo4j_query_duration = Histogram(
+    "neo4j_query_duration_seconds",
+    "Neo4j query latency by repository method.",
+    ("repository", "method"),
+)
+password_hash_duration = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hashing and verification time.",
+    ("operation",),
+)
+jwt_duration = Histogram(
+    "jwt_duration_seconds",
+    "JWT signing and verification time.",
+    ("operation",),
+)
+sms_request_duration = Histogram(
+    "sms_request_duration_seconds",
+    "SMS service call latency by endpoint and outcome.",
+    ("endpoint", "outcome"),
+)
+sms_delivery_latency = Histogram(
+    "sms_outbox_delivery_latency_seconds",
+    "Time from enqueueing an SMS message to its delivery.",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
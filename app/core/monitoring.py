@@ -0,0 +1,139 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from typing import Dict, List
+
+from fastapi import FastAPI
+
+from app.core.logging import get_dropped_log_records
+from app.core.metrics import CallbackMetric, LabelValues
+from app.core.settings.app import AppSettings
+from app.core.tracing import tracer
+from app.resources import strings_factory
+from app.services import rate_limit
+from app.services.circuit_breaker import CircuitState
+from app.services.forward_auth import forward_auth_cache
+from app.services.token import access_token_cache
+from app.services.validate import normalize_phone
+
+
+def _collect_cache_hits() -> Dict[LabelValues, float]:
+    return {
+        ("access_token",): access_token_cache.hits,
+        ("forward_auth",): forward_auth_cache.hits,
+        ("phone",): normalize_phone.cache_info().hits,
+        ("language",): strings_factory.get_language.cache_info().hits,
+    }
+
+
+def _collect_cache_misses() -> Dict[LabelValues, float]:
+    return {
+        ("access_token",): access_token_cache.misses,
+        ("forward_auth",): forward_auth_cache.misses,
+        ("phone",): normalize_phone.cache_info().misses,
+        ("language",): strings_factory.get_language.cache_info().misses,
+    }
+
+
+def _collect_dropped_spans() -> Dict[LabelValues, float]:
+    if tracer.exporter is None:
+        return {}
+
+    return {(): tracer.exporter.dropped}
+
+
+cache_hits = CallbackMetric("cache_hits_total", "Cache lookups served from the cache.", "counter", ("cache",), _collect_cache_hits)
+cache_misses = CallbackMetric("cache_misses_total", "Cache lookups that missed.", "counter", ("cache",), _collect_cache_misses)
+log_records_dropped = CallbackMetric(
+    "log_records_dropped_total",
+    "Log records below WARNING dropped because the log writer queue was full.",
+    "counter",
+    (),
+    lambda: {(): get_dropped_log_records()},
+)
+tracing_spans_dropped = CallbackMetric("tracing_spans_dropped_total", "Finished spans dropped because the export buffer was full.", "counter", (), _collect_dropped_spans)
+
+rate_limit_requests = CallbackMetric("rate_limit_requests_total", "Rate limited attempts by limiter and result.", "counter", ("limiter", "result"))
+neo4j_pool_connections = CallbackMetric("neo4j_pool_connections", "Neo4j driver pool connections by state.", "gauge", ("address", "state"))
+neo4j_pool_max_connections = CallbackMetric("neo4j_pool_max_connections", "Neo4j driver pool size limit per address.", "gauge")
+sms_outbox_queue_depth = CallbackMetric("sms_outbox_queue_depth", "SMS messages waiting in the outbox.", "gauge")
+sms_outbox_messages = CallbackMetric("sms_outbox_messages_total", "SMS outbox messages by result.", "counter", ("result",))
+sms_circuit_state = CallbackMetric("sms_circuit_state", "SMS service circuit breaker state, 1 for the current one.", "gauge", ("state",))
+sms_circuit_opened = CallbackMetric("sms_circuit_opened_total", "Times the SMS service circuit breaker opened.", "counter")
+phone_sweeper_phones = CallbackMetric("phone_sweeper_phones_total", "Phone nodes processed by the sweeper by action.", "counter", ("action",))
+
+
+def register_application_metrics(app: FastAPI, settings: AppSettings) -> None:
+    limiters: List[rate_limit.SlidingWindowLimiter] = []
+
+    login_limiter = rate_limit.get_login_limiter(
+        settings.login_attempts_per_username,
+        settings.login_attempts_per_host,
+        settings.login_attempts_window,
+        settings.redis_url,
+    )
+    limiters.extend((login_limiter.username_limiter, login_limiter.host_limiter))
+
+    verification_code_limiter = rate_limit.get_verification_code_limiter(
+        settings.verification_code_resend_timeout,
+        settings.verification_codes_per_day,
+        settings.redis_url,
+    )
+    limiters.extend((verification_code_limiter.resend_limiter, verification_code_limiter.daily_limiter))
+
+    def collect_rate_limit_requests() -> Dict[LabelValues, float]:
+        samples: Dict[LabelValues, float] = {}
+        for limiter in limiters:
+            samples[(limiter.name, "allowed")] = limiter.allowed
+            samples[(limiter.name, "rejected")] = limiter.rejected
+
+        return samples
+
+    def collect_neo4j_pool_connections() -> Dict[LabelValues, float]:
+        samples: Dict[LabelValues, float] = {}
+
+        connections = getattr(getattr(app.state.driver, "_pool", None), "connections", {})
+        for address, pool in list(connections.items()):
+            in_use = sum(1 for connection in pool if connection.in_use)
+            samples[(str(address), "in_use")] = in_use
+            samples[(str(address), "idle")] = len(pool) - in_use
+
+        return samples
+
+    def collect_neo4j_pool_max_connections() -> Dict[LabelValues, float]:
+        pool_config = getattr(getattr(app.state.driver, "_pool", None), "pool_config", None)
+        if not pool_config:
+            return {}
+
+        return {(): pool_config.max_connection_pool_size}
+
+    outbox = app.state.sms_outbox
+    sweeper = app.state.phone_sweeper
+
+    rate_limit_requests.callback = collect_rate_limit_requests
+    neo4j_pool_connections.callback = collect_neo4j_pool_connections
+    neo4j_pool_max_connections.callback = collect_neo4j_pool_max_connections
+    sms_outbox_queue_depth.callback = lambda: {(): outbox.queue_depth}
+    sms_outbox_messages.callback = lambda: {
+        ("delivered",): outbox.delivered,
+        ("retried",): outbox.retried,
+        ("rejected",): outbox.rejected,
+        ("expired",): outbox.expired,
+    }
+    sms_circuit_state.callback = lambda: {(state.value,): int(outbox.breaker.state == state) for state in CircuitState}
+    sms_circuit_opened.callback = lambda: {(): outbox.breaker.opened}
+    phone_sweeper_phones.callback = lambda: {
+        ("deleted",): sweeper.deleted,
+        ("cleared",): sweeper.cleared,
+    }
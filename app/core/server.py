@@ -0,0 +1,211 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Production server: one shared socket served by a supervised pool of uvicorn worker processes."""
+
+import importlib.util
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+
+from multiprocessing.context import SpawnProcess
+from random import randint
+from typing import Callable, List
+
+import uvicorn
+
+from jose import JOSEError
+from loguru import logger
+
+from app.core.config import get_app_settings
+from app.core.settings.app import AppSettings
+from app.services.token import create_tokens_for_user, get_user_id_from_access_token
+
+APPLICATION = "app.app:app"
+STARTUP_FAILURE = 3
+
+LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+HTTP = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+spawn = multiprocessing.get_context("spawn")
+
+
+def check_keys(settings: AppSettings) -> bool:
+    try:
+        token_access, _ = create_tokens_for_user(0, "check", settings.private_key)
+    except (JOSEError, ValueError) as exception:
+        logger.error(f"Private key {settings.private_key_path} can not sign tokens: {exception}")
+        return False
+
+    if get_user_id_from_access_token(token_access, settings.public_key) is None:
+        logger.error(f"Public key {settings.public_key_path} does not verify tokens signed by {settings.private_key_path}")
+        return False
+
+    return True
+
+
+def run_worker(sockets: List[socket.socket], max_requests: int) -> None:
+    config = uvicorn.Config(APPLICATION, loop=LOOP, http=HTTP, proxy_headers=True, limit_max_requests=max_requests or None)
+    server = uvicorn.Server(config)
+    server.run(sockets=sockets)
+
+    if not server.started:
+        sys.exit(STARTUP_FAILURE)
+
+
+class Supervisor(object):
+    """Keeps the given number of workers serving the shared socket.
+
+    Workers that exit after their request limit or crash are replaced. A worker that fails
+    to start stops the whole server, since every new one would fail the same way.
+    """
+
+    def __init__(
+            self,
+            target: Callable[[List[socket.socket], int], None],
+            sockets: List[socket.socket],
+            workers: int,
+            max_requests: int,
+    ) -> None:
+        self._target = target
+        self._sockets = sockets
+        self._workers = workers
+        self._max_requests = max_requests
+        self._processes: List[SpawnProcess] = []
+        self._should_exit = threading.Event()
+
+        self.restarts = 0
+        self.exit_code = 0
+
+    def run(self) -> int:
+        handlers = {
+            signal_number: signal.signal(signal_number, lambda *_: self.stop())
+            for signal_number in (signal.SIGINT, signal.SIGTERM)
+        }
+
+        logger.info(f"Starting {self._workers} workers with {LOOP} and {HTTP}")
+        self._processes = [self._start_worker() for _ in range(self._workers)]
+
+        while not self._should_exit.wait(0.5):
+            self._replace_exited_workers()
+
+        self._stop_workers()
+
+        for signal_number, handler in handlers.items():
+            signal.signal(signal_number, handler)
+
+        return self.exit_code
+
+    def stop(self) -> None:
+        self._should_exit.set()
+
+    def _start_worker(self) -> SpawnProcess:
+        # Spread recycling so that workers do not restart at the same time
+        max_requests = self._max_requests + randint(0, self._max_requests // 10) if self._max_requests else 0
+
+        process = spawn.Process(target=self._target, args=(self._sockets, max_requests))
+        process.start()
+
+        return process
+
+    def _replace_exited_workers(self) -> None:
+        for index, process in enumerate(self._processes):
+            if process.is_alive():
+                continue
+
+            if process.exitcode == STARTUP_FAILURE:
+                logger.error(f"Worker {process.pid} failed to start, stopping")
+                self.exit_code = STARTUP_FAILURE
+                self._should_exit.set()
+                return
+
+            logger.info(f"Worker {process.pid} exited with code {process.exitcode}, starting a new one")
+            self._processes[index] = self._start_worker()
+            self.restarts += 1
+
+    def _stop_workers(self) -> None:
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+
+        for process in self._processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.kill()
+
+
+def get_cpu_quota() -> float | None:
+    """CPUs granted by the cgroup quota, cgroup v2 first, None when the container is not limited."""
+    try:
+        with open(CGROUP_CPU_MAX) as cpu_max:
+            quota, period = cpu_max.read().split()
+    except (OSError, ValueError):
+        try:
+            with open(CGROUP_CPU_QUOTA) as cpu_quota, open(CGROUP_CPU_PERIOD) as cpu_period:
+                quota, period = cpu_quota.read().strip(), cpu_period.read().strip()
+        except OSError:
+            return None
+
+    if quota in ("max", "-1"):
+        return None
+
+    try:
+        return int(quota) / int(period)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def get_cpu_count() -> int:
+    """CPUs this process may actually use: the affinity mask capped by the container CPU quota."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+
+    quota = get_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, int(quota))
+
+    return max(cpus, 1)
+
+
+def get_worker_count(settings: AppSettings) -> int:
+    workers = settings.server_workers or get_cpu_count()
+
+    if workers > 1 and not settings.redis_url:
+        # Verification codes and rate limits live in process memory without Redis
+        logger.warning(f"REDIS_URL is empty, starting 1 worker instead of {workers}")
+        return 1
+
+    return workers
+
+
+def main() -> int:
+    settings = get_app_settings()
+    settings.configure_logging()
+
+    if not check_keys(settings):
+        return STARTUP_FAILURE
+
+    config = uvicorn.Config(APPLICATION, host=settings.server_host, port=settings.server_port)
+    sockets = [config.bind_socket()]
+
+    return Supervisor(run_worker, sockets, get_worker_count(settings), settings.server_max_requests).run()
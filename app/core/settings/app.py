@@ -13,13 +13,11 @@
 #  limitations under the License.
 
 import logging
-import sys
 
 from typing import Any, Dict, List, Tuple
-from loguru import logger
 from pydantic import FilePath, AnyHttpUrl
 
-from app.core.logging import InterceptHandler
+from app.core.logging import configure_logging
 from app.core.settings.base import BaseAppSettings
 
 
@@ -38,8 +36,32 @@ class AppSettings(BaseAppSettings):
     database_pass: str
 
     sms_service: AnyHttpUrl = "http://127.0.0.1:10000/api/v1"
+    sms_service_timeout: float = 5.0
+    sms_service_connect_timeout: float = 2.0
+    sms_service_max_connections: int = 100
+    sms_service_max_keepalive_connections: int = 20
+    sms_service_keepalive_expiry: float = 30.0
+    sms_service_http2: bool = False
+    sms_service_deadline: float = 10.0
+    sms_service_failure_threshold: int = 5
+    sms_service_recovery_timeout: float = 30.0
+
+    sms_outbox_workers: int = 4
+    sms_outbox_batch_size: int = 1
+    sms_outbox_poll_interval: float = 1.0
+    sms_outbox_lease: float = 30.0
+    sms_outbox_retry_base: float = 1.0
+    sms_outbox_retry_max: float = 60.0
+
+    phone_regions: Tuple[str, ...] = ()
 
     verification_code_timeout: int = 86400
+    verification_code_resend_timeout: int = 60
+    verification_codes_per_day: int = 5
+
+    phone_sweeper_interval: float = 3600.0
+    phone_sweeper_batch_size: int = 500
+    phone_sweeper_batch_pause: float = 1.0
 
     public_key_path: FilePath
     public_key: str = ""
@@ -50,11 +72,51 @@ class AppSettings(BaseAppSettings):
     api_prefix: str = "/api"
 
     jwt_token_prefix: str = "Bearer"
+    jwt_claims_only: bool = False
+
+    revocation_sync_interval: float = 1.0
+
+    login_attempts_per_username: int = 10
+    login_attempts_per_host: int = 30
+    login_attempts_window: float = 60.0
+
+    redis_url: str = ""
+
+    internal_api_key: str = ""
+
+    metrics_enabled: bool = False
+
+    server_timing_enabled: bool = False
+    server_timing_key: str = ""
+
+    tracing_enabled: bool = False
+    tracing_sample_rate: float = 0.01
+    tracing_file: str = ""
+    tracing_flush_interval: float = 1.0
+    tracing_buffer_size: int = 10000
+    tracing_trust_traceparent: bool = False
+
+    slow_query_threshold: float = 0.25
+    slow_query_profile_rate: float = 0.0
+
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval: float = 0.05
+    loop_monitor_threshold: float = 0.1
+
+    profiling_key: str = ""
+
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 0
+    server_max_requests: int = 0
 
     allowed_hosts: List[str] = ["*"]
 
     logging_level: int = logging.INFO
     loggers: Tuple[str, str] = ("uvicorn.asgi", "uvicorn.access")
+    logging_json: bool = False
+    logging_enqueue: bool = True
+    access_log_sample_rate: float = 1.0
 
     @property
     def fastapi_kwargs(self) -> Dict[str, Any]:
@@ -78,9 +140,10 @@ class AppSettings(BaseAppSettings):
         return url_string
 
     def configure_logging(self) -> None:
-        logging.getLogger().handlers = [InterceptHandler()]
-        for logger_name in self.loggers:
-            logging_logger = logging.getLogger(logger_name)
-            logging_logger.handlers = [InterceptHandler(level=self.logging_level)]
-
-        logger.configure(handlers=[{"sink": sys.stderr, "level": self.logging_level}])
+        configure_logging(
+            self.logging_level,
+            self.loggers,
+            self.logging_json,
+            self.logging_enqueue,
+            self.access_log_sample_rate,
+        )
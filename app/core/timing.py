@@ -0,0 +1,61 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Dict, Iterator
+
+from app.core.metrics import Histogram
+from app.core.tracing import start_span
+
+_phases: ContextVar[Dict[str, float] | None] = ContextVar("server_timing_phases", default=None)
+
+
+def start_timing() -> Dict[str, float]:
+    phases: Dict[str, float] = {}
+    _phases.set(phases)
+
+    return phases
+
+
+def add_phase(phase: str, elapsed: float) -> None:
+    phases = _phases.get()
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + elapsed
+
+
+@contextmanager
+def measure(
+        phase: str,
+        histogram: Histogram | None = None,
+        *label_values: str,
+        span: str = "",
+        attributes: Dict[str, Any] | None = None,
+) -> Iterator[None]:
+    started = perf_counter()
+    try:
+        with start_span(span or phase, attributes):
+            yield
+    finally:
+        elapsed = perf_counter() - started
+
+        if histogram is not None:
+            histogram.observe(elapsed, *label_values)
+
+        add_phase(phase, elapsed)
+
+
+def format_server_timing(phases: Dict[str, float]) -> str:
+    return ", ".join(f"{phase};dur={elapsed * 1000:.1f}" for phase, elapsed in phases.items())
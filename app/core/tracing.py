@@ -0,0 +1,209 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import asyncio
+import sys
+
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from os import urandom
+from random import random
+from time import time_ns
+from typing import Any, ContextManager, Dict, Iterator, List
+
+import orjson
+
+from loguru import logger
+
+TRACEPARENT_HEADER = "traceparent"
+SPAN_BUFFER_SIZE = 10000
+
+
+class Span(object):
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start", "end", "attributes", "error")
+
+    def __init__(self, trace_id: str, parent_id: str, name: str, kind: str, attributes: Dict[str, Any] | None) -> None:
+        self.trace_id = trace_id
+        self.span_id = urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start = time_ns()
+        self.end = 0
+        self.attributes = attributes or {}
+        self.error = ""
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start,
+            "endTimeUnixNano": self.end,
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "UNSET"},
+        }
+
+
+class SpanExporter(object):
+    """Buffers finished spans and writes them as JSON lines to a file or stdout, dropping spans when the buffer is full."""
+
+    def __init__(self, path: str = "", buffer_size: int = SPAN_BUFFER_SIZE) -> None:
+        self._path = path
+        self._buffer_size = buffer_size
+        self._spans: List[Span] = []
+
+        self.dropped = 0
+
+    def export(self, span: Span) -> None:
+        if len(self._spans) >= self._buffer_size:
+            self.dropped += 1
+            return
+
+        self._spans.append(span)
+
+    def _write(self, spans: List[Span]) -> None:
+        lines = b"".join(orjson.dumps(span.to_dict()) + b"\n" for span in spans)
+
+        if not self._path:
+            sys.stdout.buffer.write(lines)
+            sys.stdout.flush()
+            return
+
+        with open(self._path, "ab") as file:
+            file.write(lines)
+
+    async def flush(self) -> None:
+        spans, self._spans = self._spans, []
+        if spans:
+            await asyncio.to_thread(self._write, spans)
+
+    async def run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+
+            try:
+                await self.flush()
+            except OSError as exception:
+                logger.warning(f"Writing spans failed: {exception}")
+
+
+class Tracer(object):
+    def __init__(self) -> None:
+        self.sample_rate = 0.0
+        self.trust_traceparent = False
+        self.exporter: SpanExporter | None = None
+
+    def configure(self, sample_rate: float, exporter: SpanExporter | None, trust_traceparent: bool = False) -> None:
+        self.sample_rate = sample_rate
+        self.trust_traceparent = trust_traceparent
+        self.exporter = exporter
+
+
+tracer = Tracer()
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(traceparent: str | None) -> tuple[str, str, bool] | None:
+    if not traceparent:
+        return None
+
+    parts = traceparent.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+
+    return parts[1], parts[2], sampled
+
+
+def is_recording() -> bool:
+    return _current_span.get() is not None
+
+
+def current_traceparent() -> str:
+    span = _current_span.get()
+    if span is None:
+        return ""
+
+    return span.traceparent
+
+
+@contextmanager
+def _record(span: Span) -> Iterator[Span]:
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as exception:
+        span.error = type(exception).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end = time_ns()
+        if tracer.exporter:
+            tracer.exporter.export(span)
+
+
+def start_trace(
+        name: str,
+        traceparent: str | None = None,
+        kind: str = "SERVER",
+        attributes: Dict[str, Any] | None = None,
+        remote: bool = False,
+) -> ContextManager[Span | None]:
+    """Starts a root span, continuing the caller's trace when a traceparent is given.
+
+    The sampled flag of a remote traceparent is only followed when the tracer trusts its callers, otherwise any
+    client could force every request to be traced.
+    """
+
+    if tracer.exporter is None:
+        return nullcontext()
+
+    parent = parse_traceparent(traceparent)
+    if parent:
+        trace_id, parent_id, sampled = parent
+        if remote and not tracer.trust_traceparent:
+            sampled = random() < tracer.sample_rate
+    else:
+        trace_id, parent_id, sampled = urandom(16).hex(), "", random() < tracer.sample_rate
+
+    if not sampled:
+        return nullcontext()
+
+    return _record(Span(trace_id, parent_id, name, kind, attributes))
+
+
+def start_span(name: str, attributes: Dict[str, Any] | None = None, kind: str = "INTERNAL") -> ContextManager[Span | None]:
+    parent = _current_span.get()
+    if parent is None:
+        return nullcontext()
+
+    return _record(Span(parent.trace_id, parent.span_id, name, kind, attributes))
+
+
+def set_attribute(name: str, value: Any) -> None:
+    span = _current_span.get()
+    if span is not None:
+        span.attributes[name] = value
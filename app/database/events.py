@@ -18,6 +18,9 @@ from loguru import logger
 from neo4j import AsyncGraphDatabase, AsyncDriver, AsyncSession
 
 from app.core.settings.app import AppSettings
+from app.database.repositories.lock_repository import LockRepository
+from app.database.repositories.revocation_repository import RevocationRepository
+from app.database.repositories.sms_outbox_repository import SmsOutboxRepository
 
 
 async def connect_to_db(app: FastAPI, settings: AppSettings) -> AsyncDriver:
@@ -37,6 +40,12 @@ async def connect_to_db(app: FastAPI, settings: AppSettings) -> AsyncDriver:
     logger.info("Check auth...")
     await driver.verify_authentication()
 
+    logger.info("Create indexes...")
+    async with driver.session() as index_session:
+        await LockRepository(index_session).create_indexes()
+        await RevocationRepository(index_session).create_indexes()
+        await SmsOutboxRepository(index_session).create_indexes()
+
     session: AsyncSession = driver.session()
 
     app.state.driver = driver
@@ -0,0 +1,104 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from time import time
+from typing import Dict, Tuple
+
+try:
+    from redis import asyncio as redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+
+class KeyValueStore(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+
+class MemoryKeyValueStore(KeyValueStore):
+    """Local stand-in for the redis store, values live in the worker process only."""
+
+    PURGE_INTERVAL = 60
+
+    def __init__(self) -> None:
+        self._values: Dict[str, Tuple[float, str]] = {}
+        self._purged_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    async def get(self, key: str) -> str | None:
+        entry = self._values.get(key)
+        if not entry:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time():
+            del self._values[key]
+            return None
+
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        now = time()
+        if now - self._purged_at > self.PURGE_INTERVAL:
+            self._purge(now)
+
+        self._values[key] = (now + ttl, value)
+
+    async def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+
+    def _purge(self, now: float) -> None:
+        expired = [key for key, (expires_at, _) in self._values.items() if expires_at <= now]
+        for key in expired:
+            del self._values[key]
+
+        self._purged_at = now
+
+
+class RedisKeyValueStore(KeyValueStore):
+    def __init__(self, url: str) -> None:
+        if redis is None:
+            raise RuntimeError("Package 'redis' is required for the redis key value store")
+
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> str | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self._client.set(key, value, ex=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+
+@lru_cache
+def get_key_value_store(redis_url: str = "") -> KeyValueStore:
+    if redis_url:
+        return RedisKeyValueStore(redis_url)
+
+    return MemoryKeyValueStore()
@@ -0,0 +1,80 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Rewrite stored phone numbers to E.164, the form every lookup uses.
+
+Numbers stored before lookups were normalized keep the form clients sent, for
+example "+375 25 765-43-21", and can not be found any more. Run once per
+database, it is safe to run again:
+
+    python -m app.database.migrate_phones
+"""
+
+import asyncio
+
+from typing import Tuple
+
+from loguru import logger
+from neo4j import AsyncDriver, AsyncGraphDatabase
+
+from app.core.config import get_app_settings
+from app.database.repositories.phone_repository import PhoneRepository
+from app.services.validate import normalize_phone
+
+BATCH_SIZE = 500
+
+
+async def normalize_stored_phones(phone_repository: PhoneRepository, batch_size: int = BATCH_SIZE) -> Tuple[int, int]:
+    renamed = 0
+    skipped = 0
+    after = ""
+
+    while True:
+        numbers = await phone_repository.get_phone_numbers(after, batch_size)
+        if not numbers:
+            return renamed, skipped
+
+        for number in numbers:
+            # Stored numbers may come from any region, so PHONE_REGIONS is not applied here
+            normalized = normalize_phone(number)
+            if normalized == number:
+                continue
+
+            if normalized and await phone_repository.rename_phone(number, normalized):
+                renamed += 1
+                continue
+
+            skipped += 1
+            if normalized:
+                logger.warning(f"Phone {number} is not renamed, {normalized} already exists and has to be merged by hand")
+            else:
+                logger.warning(f"Phone {number} is not renamed, it is not a valid number")
+
+        after = numbers[-1]
+
+
+async def main() -> None:
+    settings = get_app_settings()
+
+    driver: AsyncDriver = AsyncGraphDatabase.driver(settings.get_database_url, auth=(settings.database_user, settings.database_pass))
+
+    async with driver:
+        async with driver.session() as session:
+            renamed, skipped = await normalize_stored_phones(PhoneRepository(session))
+
+    logger.info(f"Renamed {renamed} phones to E.164, skipped {skipped}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,178 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import asyncio
+import sys
+
+from functools import lru_cache
+from hashlib import sha1
+from random import random
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, List
+
+from loguru import logger
+from neo4j import READ_ACCESS, AsyncDriver, AsyncSession, Record, ResultSummary
+from neo4j.exceptions import DriverError, Neo4jError
+
+from app.core.metrics import Counter, Histogram, neo4j_query_duration
+from app.core.timing import measure
+from app.core.tracing import is_recording, set_attribute
+
+neo4j_query_rows = Histogram(
+    "neo4j_query_rows",
+    "Rows returned by Neo4j queries by repository method.",
+    ("repository", "method"),
+    buckets=(0, 1, 10, 100, 1000, 10000),
+)
+neo4j_slow_queries = Counter(
+    "neo4j_slow_queries_total",
+    "Neo4j queries slower than the slow query threshold.",
+    ("repository", "method"),
+)
+
+
+@lru_cache(maxsize=1024)
+def get_query_hash(query: str) -> str:
+    return sha1(query.encode()).hexdigest()[:16]
+
+
+def get_parameters_shape(parameters: Dict[str, Any]) -> str:
+    return ",".join(f"{name}:{type(value).__name__}" for name, value in parameters.items())
+
+
+class BufferedResult(object):
+    """Records of a finished query, read the same way as a driver result."""
+
+    def __init__(self, records: List[Record], summary: ResultSummary) -> None:
+        self.records = records
+        self.summary = summary
+
+    def __aiter__(self) -> AsyncIterator[Record]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Record]:
+        for record in self.records:
+            yield record
+
+    async def single(self) -> Record | None:
+        if not self.records:
+            return None
+
+        return self.records[0]
+
+    async def consume(self) -> ResultSummary:
+        return self.summary
+
+
+class QueryProfiler(object):
+    """Re-runs a sample of slow read queries with PROFILE in a separate session and logs their plans."""
+
+    def __init__(self) -> None:
+        self.slow_query_threshold = 0.25
+        self.sample_rate = 0.0
+        self.driver: AsyncDriver | None = None
+        self._tasks: set = set()
+
+    def configure(self, slow_query_threshold: float, sample_rate: float, driver: AsyncDriver | None) -> None:
+        self.slow_query_threshold = slow_query_threshold
+        self.sample_rate = sample_rate
+        self.driver = driver
+
+    def should_profile(self, summary: ResultSummary) -> bool:
+        return self.driver is not None and summary.query_type == "r" and random() < self.sample_rate
+
+    def profile(self, name: str, query: str, parameters: Dict[str, Any]) -> None:
+        task = asyncio.create_task(self._profile(name, query, parameters))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _profile(self, name: str, query: str, parameters: Dict[str, Any]) -> None:
+        try:
+            async with self.driver.session(default_access_mode=READ_ACCESS) as session:
+                result = await session.run(f"PROFILE {query}", **parameters)
+                summary: ResultSummary = await result.consume()
+        except (DriverError, Neo4jError) as exception:
+            logger.warning(f"Profiling query {name} failed: {exception}")
+            return
+
+        if not summary.profile:
+            return
+
+        logger.warning(
+            f"Query {name} ({get_query_hash(query)}) profile: {get_db_hits(summary.profile)} db hits, "
+            f"plan {format_plan(summary.profile)}"
+        )
+
+
+def get_db_hits(plan: Dict[str, Any]) -> int:
+    return plan.get("dbHits", 0) + sum(get_db_hits(child) for child in plan.get("children", []))
+
+
+def format_plan(plan: Dict[str, Any]) -> str:
+    operator = f"{plan.get('operatorType', '?')}(rows={plan.get('rows', 0)}, dbHits={plan.get('dbHits', 0)})"
+
+    children = plan.get("children", [])
+    if not children:
+        return operator
+
+    return f"{operator} <- " + " + ".join(format_plan(child) for child in children)
+
+
+query_profiler = QueryProfiler()
+
+
+class QueryExecutor(object):
+    """Runs every repository query, buffering its records and recording latency, rows and slow queries."""
+
+    def __init__(self, session: AsyncSession, repository: str) -> None:
+        self._session = session
+        self._repository = repository
+
+    async def run(self, query: str, **parameters: Any) -> BufferedResult:
+        method = sys._getframe(1).f_code.co_name
+
+        attributes = None
+        if is_recording():
+            attributes = {
+                "db.system": "neo4j",
+                "db.statement.hash": get_query_hash(query),
+                "db.parameters": get_parameters_shape(parameters),
+            }
+
+        started = perf_counter()
+
+        with measure("db", neo4j_query_duration, self._repository, method, span=f"{self._repository}.{method}", attributes=attributes):
+            result = await self._session.run(query, **parameters)
+            records: List[Record] = [record async for record in result]
+            summary: ResultSummary = await result.consume()
+            set_attribute("db.rows", len(records))
+
+        elapsed = perf_counter() - started
+        neo4j_query_rows.observe(len(records), self._repository, method)
+
+        if elapsed >= query_profiler.slow_query_threshold:
+            self._log_slow_query(method, query, parameters, records, elapsed)
+
+            if query_profiler.should_profile(summary):
+                query_profiler.profile(f"{self._repository}.{method}", query, parameters)
+
+        return BufferedResult(records, summary)
+
+    def _log_slow_query(self, method: str, query: str, parameters: Dict[str, Any], records: List[Record], elapsed: float) -> None:
+        neo4j_slow_queries.inc(self._repository, method)
+
+        logger.warning(
+            f"Slow query {self._repository}.{method} ({get_query_hash(query)}) took {elapsed * 1000:.1f} ms, "
+            f"{len(records)} rows, parameters {get_parameters_shape(parameters)}"
+        )
@@ -14,11 +14,13 @@
 
 from neo4j import AsyncSession
 
+from app.database.query_executor import QueryExecutor
+
 
 class BaseRepository:
     def __init__(self, session: AsyncSession) -> None:
-        self._session = session
+        self._session = QueryExecutor(session, type(self).__name__)
 
     @property
-    def session(self) -> AsyncSession:
+    def session(self) -> QueryExecutor:
         return self._session
@@ -0,0 +1,47 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from neo4j import Record
+
+from app.database.query_executor import BufferedResult
+from app.database.repositories.base_repository import BaseRepository
+
+
+class LockRepository(BaseRepository):
+    async def create_indexes(self) -> None:
+        query = """
+            CREATE CONSTRAINT lock_name IF NOT EXISTS
+            FOR (lock:Lock) REQUIRE lock.name IS UNIQUE
+        """
+
+        await self.session.run(query)
+
+    async def acquire_lock(self, name: str, owner: str, now: int, ttl: int) -> bool:
+        query = """
+            MERGE (lock:Lock {name: $name})
+            SET lock.touched_at = $now
+            WITH lock, (lock.owner IS NULL OR lock.owner = $owner OR lock.expires_at < $now) AS acquired
+            FOREACH (_ IN CASE WHEN acquired THEN [1] ELSE [] END |
+                SET lock.owner = $owner, lock.expires_at = $now + $ttl
+            )
+            RETURN acquired
+        """
+
+        result: BufferedResult = await self.session.run(query, name=name, owner=owner, now=now, ttl=ttl)
+        record: Record | None = await result.single()
+
+        if not record:
+            return False
+
+        return record["acquired"]
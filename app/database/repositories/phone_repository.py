@@ -12,61 +12,95 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from loguru import logger
-from neo4j import AsyncResult, Record
+from typing import List
 
+from neo4j import Record
+
+from app.database.query_executor import BufferedResult
 from app.database.repositories.base_repository import BaseRepository
-from app.models.domain.verification_code import VerificationCode
 
 
 class PhoneRepository(BaseRepository):
-    async def update_verification_code_by_phone(self, phone: str, secret: str, token: str, code: str):
+    async def is_attached_by_phone(self, phone: str) -> bool:
+        query = """
+               MATCH (phone:Phone {number: $phone})-[:Attached]->()
+               RETURN phone
+           """
+
+        result: BufferedResult = await self.session.run(query, phone=phone)
+        record: Record | None = await result.single()
+
+        if record:
+            return True
+
+        return False
+
+    async def delete_unattached_phones(self, now: int, limit: int) -> int:
         query = """
-            MERGE (phone:Phone {number: $phone})
-            SET
-                phone.secret = $secret,
-                phone.verification_token = $token,
-                phone.verification_code = $code
+            MATCH (phone:Phone)
+            WHERE NOT (phone)-[:Attached]->()
+                AND coalesce(phone.verification_expires_at, 0) <= $now
+            WITH phone LIMIT $limit
+            DELETE phone
+            RETURN count(phone) AS deleted
         """
 
-        await self.session.run(query, phone=phone, secret=secret, token=token, code=code)
+        result: BufferedResult = await self.session.run(query, now=now, limit=limit)
+        record: Record | None = await result.single()
 
-    async def get_verification_code_by_phone(self, phone: str) -> VerificationCode | None:
+        if not record:
+            return 0
+
+        return record["deleted"]
+
+    async def clear_verification_by_attached_phones(self, now: int, limit: int) -> int:
         query = """
-            MATCH (phone:Phone {number: $phone})
-            RETURN
-                phone.secret AS secret,
-                phone.verification_token AS verification_token,
-                phone.verification_code AS verification_code
+            MATCH (phone:Phone)-[:Attached]->()
+            WHERE (phone.secret IS NOT NULL OR phone.verification_code IS NOT NULL)
+                AND coalesce(phone.verification_expires_at, 0) <= $now
+            WITH phone LIMIT $limit
+            REMOVE
+                phone.secret,
+                phone.verification_token,
+                phone.verification_code,
+                phone.verification_issued_at,
+                phone.verification_expires_at
+            RETURN count(phone) AS cleared
         """
 
-        result: AsyncResult = await self.session.run(query, phone=phone)
+        result: BufferedResult = await self.session.run(query, now=now, limit=limit)
         record: Record | None = await result.single()
 
         if not record:
-            logger.warning("Query result is empty")
-            return None
+            return 0
+
+        return record["cleared"]
+
+    async def get_phone_numbers(self, after: str, limit: int) -> List[str]:
+        query = """
+            MATCH (phone:Phone)
+            WHERE phone.number > $after
+            RETURN phone.number AS number
+            ORDER BY number
+            LIMIT $limit
+        """
 
-        secret: str = record["secret"]
-        verification_token: str = record["verification_token"]
-        verification_code: int = record["verification_code"]
+        result: BufferedResult = await self.session.run(query, after=after, limit=limit)
 
-        return VerificationCode(
-            secret=secret,
-            token=verification_token,
-            code=verification_code
-        )
+        return [record["number"] async for record in result]
 
-    async def is_attached_by_phone(self, phone: str) -> bool:
+    async def rename_phone(self, number: str, new_number: str) -> bool:
         query = """
-               MATCH (phone:Phone {number: $phone})-[:Attached]->()
-               RETURN phone
-           """
+            MATCH (phone:Phone {number: $number})
+            WHERE NOT EXISTS { MATCH (:Phone {number: $new_number}) }
+            SET phone.number = $new_number
+            RETURN count(phone) AS renamed
+        """
 
-        result: AsyncResult = await self.session.run(query, phone=phone)
+        result: BufferedResult = await self.session.run(query, number=number, new_number=new_number)
         record: Record | None = await result.single()
 
-        if record:
-            return True
+        if not record:
+            return False
 
-        return False
+        return record["renamed"] > 0
@@ -0,0 +1,79 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from typing import List
+
+from neo4j import Record
+
+from app.database.query_executor import BufferedResult
+from app.database.repositories.base_repository import BaseRepository
+
+
+class RevocationRepository(BaseRepository):
+    async def create_indexes(self) -> None:
+        query = """
+            CREATE INDEX revocation_created_at IF NOT EXISTS
+            FOR (revocation:Revocation) ON (revocation.created_at)
+        """
+
+        await self.session.run(query)
+
+    async def create_token_revocation(self, token_id: str, expires_at: int) -> None:
+        query = """
+            CREATE (revocation:Revocation)
+            SET
+                revocation.token_id = $token_id,
+                revocation.expires_at = $expires_at,
+                revocation.created_at = timestamp()
+        """
+
+        await self.session.run(query, token_id=token_id, expires_at=expires_at)
+
+    async def create_user_revocation(self, user_id: int, revoked_at: int, expires_at: int) -> None:
+        query = """
+            CREATE (revocation:Revocation)
+            SET
+                revocation.user_id = $user_id,
+                revocation.revoked_at = $revoked_at,
+                revocation.expires_at = $expires_at,
+                revocation.created_at = timestamp()
+        """
+
+        await self.session.run(query, user_id=user_id, revoked_at=revoked_at, expires_at=expires_at)
+
+    async def get_revocations_created_after(self, created_at: int) -> List[Record]:
+        query = """
+            MATCH (revocation:Revocation)
+            WHERE revocation.created_at > $created_at
+            RETURN
+                revocation.token_id AS token_id,
+                revocation.user_id AS user_id,
+                revocation.revoked_at AS revoked_at,
+                revocation.expires_at AS expires_at,
+                revocation.created_at AS created_at
+        """
+
+        result: BufferedResult = await self.session.run(query, created_at=created_at)
+        records: List[Record] = [record async for record in result]
+
+        return records
+
+    async def delete_expired_revocations(self, now: int) -> None:
+        query = """
+            MATCH (revocation:Revocation)
+            WHERE revocation.expires_at <= $now
+            DELETE revocation
+        """
+
+        await self.session.run(query, now=now)
@@ -0,0 +1,132 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from typing import List
+
+from neo4j import Record
+
+from app.database.query_executor import BufferedResult
+from app.database.repositories.base_repository import BaseRepository
+
+
+class SmsOutboxRepository(BaseRepository):
+    async def create_indexes(self) -> None:
+        query = """
+            CREATE CONSTRAINT sms_message_key IF NOT EXISTS
+            FOR (message:SmsMessage) REQUIRE message.key IS UNIQUE
+        """
+
+        await self.session.run(query)
+
+        query = """
+            CREATE INDEX sms_message_next_attempt_at IF NOT EXISTS
+            FOR (message:SmsMessage) ON (message.next_attempt_at)
+        """
+
+        await self.session.run(query)
+
+    async def create_message(self, key: str, phone: str, message: str, created_at: float, expires_at: int, traceparent: str = "") -> None:
+        query = """
+            MERGE (message:SmsMessage {key: $key})
+            ON CREATE SET
+                message.phone = $phone,
+                message.message = $message,
+                message.attempts = 0,
+                message.created_at = $created_at,
+                message.next_attempt_at = $created_at,
+                message.expires_at = $expires_at,
+                message.traceparent = $traceparent
+        """
+
+        await self.session.run(
+            query,
+            key=key,
+            phone=phone,
+            message=message,
+            created_at=created_at,
+            expires_at=expires_at,
+            traceparent=traceparent,
+        )
+
+    async def claim_messages(self, now: float, lease: float, limit: int) -> List[Record]:
+        query = """
+            MATCH (message:SmsMessage)
+            WHERE message.next_attempt_at <= $now AND message.expires_at > $now
+            WITH message ORDER BY message.next_attempt_at LIMIT $limit
+            SET message.claimed_at = $now
+            WITH message
+            WHERE message.next_attempt_at <= $now
+            SET message.next_attempt_at = $now + $lease
+            RETURN
+                message.key AS key,
+                message.phone AS phone,
+                message.message AS message,
+                message.attempts AS attempts,
+                message.created_at AS created_at,
+                message.traceparent AS traceparent
+        """
+
+        result: BufferedResult = await self.session.run(query, now=now, lease=lease, limit=limit)
+        records: List[Record] = [record async for record in result]
+
+        return records
+
+    async def delete_messages(self, keys: List[str]) -> None:
+        query = """
+            MATCH (message:SmsMessage)
+            WHERE message.key IN $keys
+            DELETE message
+        """
+
+        await self.session.run(query, keys=keys)
+
+    async def retry_message(self, key: str, attempts: int, next_attempt_at: float) -> None:
+        query = """
+            MATCH (message:SmsMessage {key: $key})
+            SET
+                message.attempts = $attempts,
+                message.next_attempt_at = $next_attempt_at
+        """
+
+        await self.session.run(query, key=key, attempts=attempts, next_attempt_at=next_attempt_at)
+
+    async def delete_expired_messages(self, now: float) -> int:
+        query = """
+            MATCH (message:SmsMessage)
+            WHERE message.expires_at <= $now
+            DELETE message
+            RETURN count(message) AS deleted
+        """
+
+        result: BufferedResult = await self.session.run(query, now=now)
+        record: Record | None = await result.single()
+
+        if not record:
+            return 0
+
+        return record["deleted"]
+
+    async def count_messages(self) -> int:
+        query = """
+            MATCH (message:SmsMessage)
+            RETURN count(message) AS count
+        """
+
+        result: BufferedResult = await self.session.run(query)
+        record: Record | None = await result.single()
+
+        if not record:
+            return 0
+
+        return record["count"]
@@ -12,8 +12,9 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from neo4j import AsyncResult, Record
+from neo4j import Record
 
+from app.database.query_executor import BufferedResult
 from app.database.repositories.base_repository import BaseRepository
 
 
@@ -25,7 +26,7 @@ class TokenRepository(BaseRepository):
             RETURN user.token as token
         """
 
-        result: AsyncResult = await self.session.run(query, user_id=user_id)
+        result: BufferedResult = await self.session.run(query, user_id=user_id)
         record: Record | None = await result.single()
 
         if not record:
@@ -12,12 +12,15 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from typing import Dict, List
+
 from loguru import logger
 
-from neo4j import Record, AsyncResult
+from neo4j import Record
 from neo4j.exceptions import ConstraintError
 from pydantic import HttpUrl
 
+from app.database.query_executor import BufferedResult
 from app.database.repositories.base_repository import BaseRepository
 from app.models.domain.user import User, UserInDB, Gender
 
@@ -39,7 +42,7 @@ class UserRepository(BaseRepository):
             **kwargs
     ) -> UserInDB | None:
         query = """
-            MATCH (phone:Phone {number: $phone})
+            MERGE (phone:Phone {number: $phone})
             CREATE (phone)-[:Attached]->(user:User)
             SET
                 user.username = $username,
@@ -67,9 +70,8 @@ class UserRepository(BaseRepository):
         user.region = region
         user.image = image
 
-        result: AsyncResult = await self.session.run(query, **user.__dict__)
-
         try:
+            result: BufferedResult = await self.session.run(query, **user.__dict__)
             record: Record | None = await result.single()
         except ConstraintError as exception:
             logger.warning(exception)
@@ -90,7 +92,7 @@ class UserRepository(BaseRepository):
             RETURN id(user) AS user_id, user, phone
         """
 
-        result: AsyncResult = await self.session.run(query, user_id=user_id)
+        result: BufferedResult = await self.session.run(query, user_id=user_id)
         record: Record | None = await result.single()
         user: UserInDB = self._get_user_from_record(record)
 
@@ -102,7 +104,7 @@ class UserRepository(BaseRepository):
             RETURN id(user) AS user_id, user, phone
         """
 
-        result: AsyncResult = await self.session.run(query, username=username)
+        result: BufferedResult = await self.session.run(query, username=username)
         record: Record | None = await result.single()
         user: UserInDB = self._get_user_from_record(record)
 
@@ -114,7 +116,7 @@ class UserRepository(BaseRepository):
             RETURN id(user) AS user_id, user, phone
         """
 
-        result: AsyncResult = await self.session.run(query, phone=phone)
+        result: BufferedResult = await self.session.run(query, phone=phone)
         record: Record | None = await result.single()
         user: UserInDB = self._get_user_from_record(record)
 
@@ -127,6 +129,21 @@ class UserRepository(BaseRepository):
 
         return False
 
+    async def get_blocked_state_by_user_ids(self, user_ids: List[int]) -> Dict[int, bool]:
+        query = """
+            MATCH (user:User)
+            WHERE id(user) IN $user_ids
+            RETURN id(user) AS user_id, user.is_blocked AS is_blocked
+        """
+
+        result: BufferedResult = await self.session.run(query, user_ids=user_ids)
+
+        blocked_by_user_id: Dict[int, bool] = {}
+        async for record in result:
+            blocked_by_user_id[record["user_id"]] = bool(record["is_blocked"])
+
+        return blocked_by_user_id
+
     async def update_user_by_user_id(
             self,
             user_id: int,
@@ -185,9 +202,9 @@ class UserRepository(BaseRepository):
         query = """
             MATCH (phone:Phone)-[r:Attached]->(user:User)
             WHERE id(user) = $user_id
-            MATCH (newPhone:Phone {number: $phone})
+            MERGE (newPhone:Phone {number: $phone})
             CREATE (newPhone)-[:Attached]->(user)
-            DELETE r
+            DELETE r, phone
         """
 
         await self.session.run(query, user_id=user_id, phone=phone)
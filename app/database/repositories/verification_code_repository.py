@@ -0,0 +1,48 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from time import time
+
+from app.database.key_value_store import KeyValueStore
+from app.models.domain.verification_code import VerificationCode
+
+
+class VerificationCodeRepository(object):
+    def __init__(self, store: KeyValueStore) -> None:
+        self._store = store
+
+    @property
+    def store(self) -> KeyValueStore:
+        return self._store
+
+    async def update_verification_code_by_phone(self, phone: str, verification_code: VerificationCode) -> None:
+        ttl = verification_code.expires_at - int(time())
+        if ttl <= 0:
+            return
+
+        await self.store.set(self._get_key(phone), verification_code.model_dump_json(), ttl)
+
+    async def get_verification_code_by_phone(self, phone: str) -> VerificationCode | None:
+        value = await self.store.get(self._get_key(phone))
+        if not value:
+            return None
+
+        return VerificationCode.model_validate_json(value)
+
+    async def delete_verification_code_by_phone(self, phone: str) -> None:
+        await self.store.delete(self._get_key(phone))
+
+    @staticmethod
+    def _get_key(phone: str) -> str:
+        return f"verification_code:{phone}"
@@ -16,6 +16,7 @@ from app.models.common import BaseAppModel
 
 
 class VerificationCode(BaseAppModel):
-    secret: str
     token: str
     code: str
+    issued_at: int
+    expires_at: int
@@ -0,0 +1,37 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from typing import List
+
+from pydantic import Field
+
+from app.models.common import BaseAppModel
+
+INTROSPECT_TOKENS_MAX = 100
+
+
+class TokensIntrospect(BaseAppModel):
+    tokens: List[str] = Field(..., min_length=1, max_length=INTROSPECT_TOKENS_MAX)
+
+
+class TokenIntrospection(BaseAppModel):
+    active: bool = False
+    user_id: int | None = None
+    username: str | None = None
+    expires_at: int | None = None
+    is_blocked: bool | None = None
+
+
+class TokensIntrospectResponse(BaseAppModel):
+    tokens: List[TokenIntrospection]
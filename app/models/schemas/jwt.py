@@ -19,9 +19,37 @@ from app.models.common import BaseAppModel
 
 class JWTMeta(BaseAppModel):
     exp: datetime
+    iat: datetime
+    iat_us: int
+    jti: str
     sub: str
 
 
 class JWTUser(BaseAppModel):
     user_id: int
     username: str
+
+
+class JWTProfile(BaseAppModel):
+    phone: str
+    first_name: str = ""
+    last_name: str = ""
+    gender: str = "undefined"
+    age: int = 18
+    country: str = ""
+    region: str = ""
+    image: str = ""
+    is_blocked: bool = False
+
+
+class JWTAccess(JWTUser):
+    exp: int
+    iat: int = 0
+    iat_us: int = 0
+    jti: str = ""
+    profile: JWTProfile | None = None
+
+    @property
+    def issued_at(self) -> int:
+        """Issue time in microseconds, iat alone is whole seconds and cannot be ordered against a revocation."""
+        return self.iat_us or self.iat * 1000000
@@ -12,12 +12,14 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from pydantic import typing
+from typing import Generic, TypeVar
 
 from app.models.common import BaseAppModel
 
+PayloadT = TypeVar("PayloadT")
 
-class WrapperResponse(BaseAppModel):
+
+class WrapperResponse(BaseAppModel, Generic[PayloadT]):
     success: bool = True
-    payload: typing.Any = None
+    payload: PayloadT | None = None
     message: str = ""
@@ -16,8 +16,10 @@ class StringsEN(object):
     USER_CREATE_ERROR = "User create error"
 
     USER_DOES_NOT_EXIST_ERROR = "User does not exist"
+    USER_IS_BLOCKED = "User is blocked"
 
     INCORRECT_LOGIN_INPUT = "incorrect username or password"
+    TOO_MANY_LOGIN_ATTEMPTS = "Too many login attempts, try again later"
     USERNAME_TAKEN = "User with this username already exists"
     USERNAME_DOES_NOT_EXIST = "User with this username does not exist"
     EMAIL_TAKEN = "User with this email already exists"
@@ -33,10 +35,17 @@ class StringsEN(object):
     VERIFICATION_CODE_IS_WRONG = "Verification code is wrong"
     VERIFICATION_CODE_ALREADY_EXISTS = "Verification code already exists"
     VERIFICATION_CODE_WRONG = "Verification code is wrong"
+    VERIFICATION_CODE_TOO_MANY_REQUESTS = "Too many verification code requests, try again later"
 
     WRONG_TOKEN_PREFIX = "Unsupported authorization type"
     MALFORMED_PAYLOAD = "Could not validate credentials"
     WRONG_TOKEN_PAIR = "Wrong token pair"
     REFRESH_TOKEN_IS_REVOKED = "Refresh token is revoked"
+    ACCESS_TOKEN_IS_REVOKED = "Access token is revoked"
 
     AUTHENTICATION_REQUIRED = "Authentication required"
+    INTERNAL_API_KEY_IS_WRONG = "Internal api key is wrong"
+    PROFILING_KEY_IS_WRONG = "Profiling key is wrong"
+
+    PROFILER_IS_BUSY = "Profiler is already running"
+    MEMORY_TRACING_IS_NOT_STARTED = "Memory tracing is not started"
@@ -12,12 +12,58 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
 from .strings_en import StringsEN
 from .strings_ru import StringsRU
 
+DEFAULT_LANGUAGE = "en"
+
+LANGUAGES: Dict[str, StringsEN] = {
+    "en": StringsEN(),
+    "ru": StringsRU(),
+}
+
+
+def get_messages(strings: StringsEN) -> List[str]:
+    return [getattr(strings, name) for name in dir(strings) if name.isupper() and isinstance(getattr(strings, name), str)]
+
+
+def _parse_accept_language(language: str) -> List[Tuple[float, str]]:
+    ranges: List[Tuple[float, str]] = []
+
+    for item in language.split(","):
+        tag, _, parameters = item.partition(";")
+        tag = tag.strip().lower()
+        if not tag:
+            continue
 
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            name, _, value = parameter.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if quality > 0:
+            ranges.append((quality, tag))
+
+    ranges.sort(key=lambda language_range: language_range[0], reverse=True)
+
+    return ranges
+
+
+@lru_cache(maxsize=1024)
 def get_language(language: str) -> StringsEN:
-    if language == "ru":
-        return StringsRU()
+    for _, tag in _parse_accept_language(language):
+        if tag == "*":
+            break
+
+        strings = LANGUAGES.get(tag.split("-")[0])
+        if strings:
+            return strings
 
-    return StringsEN()
+    return LANGUAGES[DEFAULT_LANGUAGE]
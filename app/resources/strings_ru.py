@@ -19,8 +19,10 @@ class StringsRU(StringsEN):
     USER_CREATE_ERROR = "Ошибка создания нового пользователя"
 
     USER_DOES_NOT_EXIST_ERROR = "Пользователь не найден"
+    USER_IS_BLOCKED = "Пользователь заблокирован"
 
     INCORRECT_LOGIN_INPUT = "Неверный username или password"
+    TOO_MANY_LOGIN_ATTEMPTS = "Слишком много попыток входа, попробуйте позже"
     USERNAME_TAKEN = "Пользователь с указанным username существует"
     USERNAME_DOES_NOT_EXIST = "Пользователь с указанным username не найден"
     EMAIL_TAKEN = "Пользователь с указанным email существует"
@@ -36,10 +38,17 @@ class StringsRU(StringsEN):
     VERIFICATION_CODE_IS_WRONG = "Неверный код подтверждения"
     VERIFICATION_CODE_ALREADY_EXISTS = "Код подтверждения существует"
     VERIFICATION_CODE_WRONG = "Неверный код подтверждения"
+    VERIFICATION_CODE_TOO_MANY_REQUESTS = "Слишком много запросов кода подтверждения, попробуйте позже"
 
     WRONG_TOKEN_PREFIX = "Неподдерживаемый тип авторизации"
     MALFORMED_PAYLOAD = "Не действительные данные для входа"
     WRONG_TOKEN_PAIR = "Не верная пара токенов"
     REFRESH_TOKEN_IS_REVOKED = "Refresh token отозван"
+    ACCESS_TOKEN_IS_REVOKED = "Access token отозван"
 
     AUTHENTICATION_REQUIRED = "Требуется авторизация"
+    INTERNAL_API_KEY_IS_WRONG = "Неверный внутренний api ключ"
+    PROFILING_KEY_IS_WRONG = "Неверный ключ профилирования"
+
+    PROFILER_IS_BUSY = "Профилировщик уже запущен"
+    MEMORY_TRACING_IS_NOT_STARTED = "Трассировка памяти не запущена"
@@ -0,0 +1,85 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from enum import Enum
+from time import monotonic
+
+from loguru import logger
+
+
+class CircuitState(str, Enum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+class CircuitBreaker(object):
+    """Stops calls to a failing dependency, then lets a single probe through after the recovery timeout."""
+
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float) -> None:
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._state = CircuitState.closed
+        self._opened_at = 0.0
+        self._probing = False
+
+        self.failures = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.open and monotonic() - self._opened_at >= self._recovery_timeout:
+            self._set_state(CircuitState.half_open)
+
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+
+        if state == CircuitState.closed:
+            return True
+
+        if state == CircuitState.half_open and not self._probing:
+            self._probing = True
+            return True
+
+        return False
+
+    def release(self) -> None:
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probing = False
+
+        if self._state != CircuitState.closed:
+            self._set_state(CircuitState.closed)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+
+        if self._state == CircuitState.half_open or self.failures >= self._failure_threshold:
+            self._opened_at = monotonic()
+            self.opened += 1
+            self._set_state(CircuitState.open)
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state == CircuitState.open:
+            logger.warning(f"Circuit breaker {self._name} is open after {self.failures} failures")
+        else:
+            logger.info(f"Circuit breaker {self._name} is {state.value}")
+
+        self._state = state
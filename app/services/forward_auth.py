@@ -0,0 +1,71 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from time import time
+from typing import Dict, Tuple
+from urllib.parse import quote
+
+from app.services.cache import TTLCache
+from app.services.revocation import revocation_list
+from app.services.token import get_access_token_payload
+
+FORWARD_AUTH_CACHE_SIZE = 10000
+FORWARD_AUTH_CACHE_SECONDS = 5
+
+forward_auth_cache = TTLCache(FORWARD_AUTH_CACHE_SIZE)
+
+
+def get_forward_auth_headers(authorization: str | None, token_prefix: str, secret_key: str) -> Dict[str, str] | None:
+    if not authorization:
+        return None
+
+    decision: Tuple[int, int, str, Dict[str, str]] | None = forward_auth_cache.get(authorization)
+    if not decision:
+        decision = _authorize(authorization, token_prefix, secret_key)
+        if not decision:
+            return None
+
+    user_id, issued_at, token_id, headers = decision
+    if revocation_list.is_revoked(user_id, issued_at, token_id):
+        forward_auth_cache.pop(authorization)
+        return None
+
+    return headers
+
+
+def _authorize(authorization: str, token_prefix: str, secret_key: str) -> Tuple[int, int, str, Dict[str, str]] | None:
+    try:
+        prefix, token = authorization.split(" ")
+    except ValueError:
+        return None
+
+    if prefix != token_prefix:
+        return None
+
+    payload = get_access_token_payload(token, secret_key)
+    if not payload:
+        return None
+
+    if payload.profile and payload.profile.is_blocked:
+        return None
+
+    headers = {
+        "X-User-Id": str(payload.user_id),
+        "X-Username": quote(payload.username, safe=""),
+    }
+    decision = (payload.user_id, payload.issued_at, payload.jti, headers)
+
+    forward_auth_cache.set(authorization, decision, min(time() + FORWARD_AUTH_CACHE_SECONDS, payload.exp))
+
+    return decision
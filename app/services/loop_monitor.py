@@ -0,0 +1,122 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import asyncio
+import os
+import sys
+import threading
+
+from time import perf_counter
+from types import FrameType
+from typing import List
+
+from loguru import logger
+
+from app.core.metrics import Counter, Histogram
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+event_loop_lag = Histogram(
+    "event_loop_lag_seconds",
+    "Delay of the event loop heartbeat behind its schedule.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+event_loop_blocks = Counter(
+    "event_loop_blocks_total",
+    "Event loop stalls longer than the threshold by the innermost application function.",
+    ("function",),
+)
+
+
+def _is_project_frame(frame: FrameType) -> bool:
+    filename = frame.f_code.co_filename
+    return filename.startswith(PROJECT_ROOT) and "site-packages" not in filename
+
+
+def _get_function_name(frame: FrameType) -> str:
+    # co_qualname is only there from Python 3.11
+    return f"{frame.f_globals.get('__name__', '?')}.{getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)}"
+
+
+def get_project_stack(frame: FrameType | None) -> List[str]:
+    stack: List[str] = []
+
+    while frame is not None:
+        if _is_project_frame(frame):
+            stack.append(f"{_get_function_name(frame)}:{frame.f_lineno}")
+        frame = frame.f_back
+
+    stack.reverse()
+    return stack
+
+
+class LoopMonitor(object):
+    """Measures event loop lag with a heartbeat and captures the stack of the code that blocks the loop.
+
+    A watchdog thread notices when the heartbeat is late by more than the threshold and reads
+    the loop thread's current frame while the blocking call is still running.
+    """
+
+    def __init__(self, interval: float, threshold: float) -> None:
+        self._interval = interval
+        self._threshold = threshold
+        self._heartbeat = perf_counter()
+        self._thread_id = 0
+        self._stopped = threading.Event()
+
+        self.blocks = 0
+        self.last_stack: List[str] = []
+
+    async def run(self) -> None:
+        self._thread_id = threading.get_ident()
+        self._heartbeat = perf_counter()
+        self._stopped.clear()
+
+        watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        watchdog.start()
+
+        try:
+            while True:
+                expected = perf_counter() + self._interval
+                await asyncio.sleep(self._interval)
+
+                now = perf_counter()
+                event_loop_lag.observe(max(0.0, now - expected))
+                self._heartbeat = now
+        finally:
+            self._stopped.set()
+
+    def _watch(self) -> None:
+        reported = None
+
+        while not self._stopped.wait(self._interval):
+            heartbeat = self._heartbeat
+            if reported == heartbeat or perf_counter() - heartbeat < self._interval + self._threshold:
+                continue
+
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+
+            reported = heartbeat
+            self._report(get_project_stack(frame), perf_counter() - heartbeat - self._interval)
+
+    def _report(self, stack: List[str], blocked: float) -> None:
+        function = stack[-1].rsplit(":", 1)[0] if stack else "unknown"
+
+        self.blocks += 1
+        self.last_stack = stack
+        event_loop_blocks.inc(function)
+
+        logger.warning(f"Event loop blocked for at least {blocked * 1000:.0f} ms in {function}: {' -> '.join(stack)}")
@@ -0,0 +1,88 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import asyncio
+
+from time import time
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from loguru import logger
+from neo4j import AsyncDriver
+from neo4j.exceptions import DriverError, Neo4jError
+
+from app.database.repositories.lock_repository import LockRepository
+from app.database.repositories.phone_repository import PhoneRepository
+
+PHONE_SWEEPER_LOCK = "phone_sweeper"
+
+
+class PhoneSweeper(object):
+    """Deletes stale unattached phones and expired verification fields in small batches."""
+
+    def __init__(self, driver: AsyncDriver, interval: float, batch_size: int, batch_pause: float) -> None:
+        self._driver = driver
+        self._interval = interval
+        self._batch_size = batch_size
+        self._batch_pause = batch_pause
+        self._owner = uuid4().hex
+
+        self.runs = 0
+        self.deleted = 0
+        self.cleared = 0
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except (DriverError, Neo4jError) as exception:
+                logger.warning(f"Phone sweeper failed: {exception}")
+
+            await asyncio.sleep(self._interval)
+
+    async def sweep(self) -> None:
+        async with self._driver.session() as session:
+            lock_repository = LockRepository(session)
+            phone_repository = PhoneRepository(session)
+
+            if not await self._acquire_lock(lock_repository):
+                logger.debug("Phone sweeper is running on another instance")
+                return
+
+            deleted = await self._sweep_batches(phone_repository.delete_unattached_phones, lock_repository)
+            cleared = await self._sweep_batches(phone_repository.clear_verification_by_attached_phones, lock_repository)
+
+        self.runs += 1
+        self.deleted += deleted
+        self.cleared += cleared
+
+        logger.info(f"Phone sweeper deleted {deleted} unattached phones and cleared verification of {cleared} phones")
+
+    async def _sweep_batches(self, sweep_batch: Callable[[int, int], Awaitable[int]], lock_repository: LockRepository) -> int:
+        total = 0
+
+        while True:
+            count = await sweep_batch(int(time()), self._batch_size)
+            total += count
+
+            if count < self._batch_size:
+                return total
+
+            await asyncio.sleep(self._batch_pause)
+
+            if not await self._acquire_lock(lock_repository):
+                return total
+
+    async def _acquire_lock(self, lock_repository: LockRepository) -> bool:
+        return await lock_repository.acquire_lock(PHONE_SWEEPER_LOCK, self._owner, int(time()), int(self._interval * 2))
@@ -0,0 +1,133 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import sys
+import threading
+import tracemalloc
+
+from collections import Counter
+from time import perf_counter, sleep
+from types import FrameType
+from typing import List
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+class MemoryTracingNotStarted(Exception):
+    pass
+
+
+def _fold_stack(thread_name: str, frame: FrameType | None) -> str:
+    names: List[str] = []
+
+    while frame is not None:
+        # co_qualname is only there from Python 3.11
+        names.append(f"{frame.f_globals.get('__name__', '?')}.{getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)}")
+        frame = frame.f_back
+
+    names.append(thread_name)
+    names.reverse()
+
+    return ";".join(names)
+
+
+class SamplingProfiler(object):
+    """Samples the stacks of every thread from a separate thread and counts them as folded stacks.
+
+    The output is the input format of flamegraph.pl and speedscope. Only one profile runs at a time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def profile(self, seconds: float, interval: float) -> str:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy()
+
+        try:
+            stacks = self._sample(seconds, interval)
+        finally:
+            self._lock.release()
+
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    @staticmethod
+    def _sample(seconds: float, interval: float) -> Counter:
+        own_thread_id = threading.get_ident()
+        stacks: Counter = Counter()
+
+        deadline = perf_counter() + seconds
+        while perf_counter() < deadline:
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_thread_id:
+                    stacks[_fold_stack(thread_names.get(thread_id, str(thread_id)), frame)] += 1
+
+            sleep(interval)
+
+        return stacks
+
+
+class MemoryTracer(object):
+    """Keeps a tracemalloc snapshot of this worker and reports allocation growth since the previous one."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshot: tracemalloc.Snapshot | None = None
+
+    def start(self, frames: int) -> None:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+
+            self._snapshot = self._take_snapshot()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            tracemalloc.stop()
+
+    def diff(self, limit: int) -> str:
+        with self._lock:
+            if self._snapshot is None or not tracemalloc.is_tracing():
+                raise MemoryTracingNotStarted()
+
+            snapshot = self._take_snapshot()
+            statistics = snapshot.compare_to(self._snapshot, "traceback")
+            self._snapshot = snapshot
+
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"pid {os.getpid()}: traced {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB"]
+
+        for statistic in statistics[:limit]:
+            lines.append(f"{statistic.size_diff / 1024:+.1f} KiB, {statistic.count_diff:+d} blocks, {statistic.size / 1024:.1f} KiB total")
+            lines.extend(f"    {line}" for line in statistic.traceback.format(most_recent_first=True))
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+
+sampling_profiler = SamplingProfiler()
+memory_tracer = MemoryTracer()
@@ -0,0 +1,173 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from abc import ABC, abstractmethod
+from collections import deque
+from functools import lru_cache
+from time import time
+from typing import Deque, Dict, Tuple
+from uuid import uuid4
+
+from loguru import logger
+
+try:
+    from redis import asyncio as redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+REDIS_SLIDING_WINDOW_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, tonumber(ARGV[1]) - tonumber(ARGV[2]))
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return tostring(tonumber(oldest[2]) + tonumber(ARGV[2]) - tonumber(ARGV[1]))
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+redis.call('PEXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2]) * 1000))
+return '0'
+"""
+
+
+class RateLimitStoreUnavailable(Exception):
+    pass
+
+
+class RateLimitStore(ABC):
+    @abstractmethod
+    async def acquire(self, key: str, limit: int, window: float, now: float) -> float:
+        """Record a hit for key and return 0, or return seconds until the next hit is allowed."""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    PURGE_INTERVAL = 60
+
+    def __init__(self) -> None:
+        self._hits: Dict[str, Tuple[float, Deque[float]]] = {}
+        self._purged_at = 0.0
+
+    async def acquire(self, key: str, limit: int, window: float, now: float) -> float:
+        if now - self._purged_at > self.PURGE_INTERVAL:
+            self._purge(now)
+
+        entry = self._hits.get(key)
+        if entry is None:
+            entry = self._hits[key] = (window, deque())
+
+        _, hits = entry
+
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+
+        if len(hits) >= limit:
+            return hits[0] + window - now
+
+        hits.append(now)
+
+        return 0.0
+
+    def _purge(self, now: float) -> None:
+        expired = [key for key, (window, hits) in self._hits.items() if not hits or hits[-1] <= now - window]
+        for key in expired:
+            del self._hits[key]
+
+        self._purged_at = now
+
+
+class RedisRateLimitStore(RateLimitStore):
+    def __init__(self, url: str) -> None:
+        if redis is None:
+            raise RuntimeError("Package 'redis' is required for the shared rate limit store")
+
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(REDIS_SLIDING_WINDOW_SCRIPT)
+
+    async def acquire(self, key: str, limit: int, window: float, now: float) -> float:
+        try:
+            retry_after = await self._script(keys=[f"rate_limit:{key}"], args=[now, window, limit, f"{now}:{uuid4().hex}"])
+        except redis.RedisError as exception:
+            logger.warning(f"Rate limit store is unavailable: {exception!r}")
+            raise RateLimitStoreUnavailable() from exception
+
+        return float(retry_after)
+
+
+class SlidingWindowLimiter(object):
+    def __init__(self, name: str, limit: int, window: float, store: RateLimitStore) -> None:
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.store = store
+
+        self.allowed = 0
+        self.rejected = 0
+
+    async def acquire(self, key: str) -> float:
+        retry_after = await self.store.acquire(f"{self.name}:{key}", self.limit, self.window, time())
+        if retry_after > 0:
+            self.rejected += 1
+            return retry_after
+
+        self.allowed += 1
+
+        return 0.0
+
+
+class LoginLimiter(object):
+    """Fails open when the store is unavailable, a login still needs the right password."""
+
+    def __init__(self, attempts_per_username: int, attempts_per_host: int, window: float, store: RateLimitStore) -> None:
+        self.username_limiter = SlidingWindowLimiter("login:username", attempts_per_username, window, store)
+        self.host_limiter = SlidingWindowLimiter("login:host", attempts_per_host, window, store)
+
+    async def acquire(self, username: str, host: str) -> float:
+        try:
+            retry_after = await self.host_limiter.acquire(host)
+            if retry_after:
+                return retry_after
+
+            return await self.username_limiter.acquire(username)
+        except RateLimitStoreUnavailable:
+            return 0.0
+
+
+class VerificationCodeLimiter(object):
+    """Fails closed, acquire raises RateLimitStoreUnavailable rather than let SMS through unlimited."""
+
+    def __init__(self, resend_timeout: float, codes_per_day: int, store: RateLimitStore) -> None:
+        self.resend_limiter = SlidingWindowLimiter("verification:resend", 1, resend_timeout, store)
+        self.daily_limiter = SlidingWindowLimiter("verification:daily", codes_per_day, 86400, store)
+
+    async def acquire(self, phone: str) -> float:
+        retry_after = await self.resend_limiter.acquire(phone)
+        if retry_after:
+            return retry_after
+
+        return await self.daily_limiter.acquire(phone)
+
+
+@lru_cache
+def get_rate_limit_store(redis_url: str = "") -> RateLimitStore:
+    if redis_url:
+        return RedisRateLimitStore(redis_url)
+
+    return MemoryRateLimitStore()
+
+
+@lru_cache
+def get_login_limiter(attempts_per_username: int, attempts_per_host: int, window: float, redis_url: str = "") -> LoginLimiter:
+    return LoginLimiter(attempts_per_username, attempts_per_host, window, get_rate_limit_store(redis_url))
+
+
+@lru_cache
+def get_verification_code_limiter(resend_timeout: float, codes_per_day: int, redis_url: str = "") -> VerificationCodeLimiter:
+    return VerificationCodeLimiter(resend_timeout, codes_per_day, get_rate_limit_store(redis_url))
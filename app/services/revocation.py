@@ -0,0 +1,139 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import asyncio
+import heapq
+
+from time import time
+from typing import Dict, List, Tuple
+
+from loguru import logger
+from neo4j import AsyncDriver
+from neo4j.exceptions import DriverError, Neo4jError
+
+from app.database.repositories.revocation_repository import RevocationRepository
+from app.services.token import ACCESS_TOKEN_EXPIRE_MINUTES, access_token_cache
+
+REVOCATION_SYNC_OVERLAP_MS = 5000
+
+
+class RevocationList(object):
+    """Revoked token ids and users, entries expire together with the access tokens they cover.
+
+    User revocations and token issue times are in microseconds, so a token issued in the same second as a
+    revocation is still ordered correctly against it.
+    """
+
+    def __init__(self, ttl: int) -> None:
+        self._ttl = ttl
+        self._tokens: Dict[str, float] = {}
+        self._users: Dict[int, Tuple[int, float]] = {}
+        self._expirations: List[Tuple[float, str | int]] = []
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    def revoke_token(self, token_id: str, expires_at: float) -> None:
+        self._purge(time())
+
+        if self._tokens.get(token_id, 0) >= expires_at:
+            return
+
+        self._tokens[token_id] = expires_at
+        heapq.heappush(self._expirations, (expires_at, token_id))
+
+        access_token_cache.evict(lambda payload: payload.jti == token_id)
+
+    def revoke_user(self, user_id: int, revoked_at: int | None = None) -> None:
+        self._purge(time())
+
+        if revoked_at is None:
+            revoked_at = int(time() * 1000000)
+
+        entry = self._users.get(user_id)
+        if entry and entry[0] >= revoked_at:
+            return
+
+        expires_at = revoked_at / 1000000 + self._ttl
+        self._users[user_id] = (revoked_at, expires_at)
+        heapq.heappush(self._expirations, (expires_at, user_id))
+
+        access_token_cache.evict(lambda payload: payload.user_id == user_id)
+
+    def is_revoked(self, user_id: int, issued_at: int, token_id: str = "") -> bool:
+        if token_id in self._tokens:
+            return self._tokens[token_id] > time()
+
+        entry = self._users.get(user_id)
+        if not entry:
+            return False
+
+        revoked_at, expires_at = entry
+        if expires_at <= time():
+            return False
+
+        return issued_at < revoked_at
+
+    def _purge(self, now: float) -> None:
+        while self._expirations and self._expirations[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expirations)
+
+            if isinstance(key, str):
+                if self._tokens.get(key) == expires_at:
+                    del self._tokens[key]
+            elif key in self._users and self._users[key][1] == expires_at:
+                del self._users[key]
+
+
+revocation_list = RevocationList(ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+async def revoke_token(revocation_repository: RevocationRepository, token_id: str, expires_at: int) -> None:
+    revocation_list.revoke_token(token_id, expires_at)
+    await revocation_repository.create_token_revocation(token_id, expires_at)
+
+
+async def revoke_user(revocation_repository: RevocationRepository, user_id: int) -> None:
+    revoked_at = int(time() * 1000000)
+
+    revocation_list.revoke_user(user_id, revoked_at)
+    await revocation_repository.create_user_revocation(user_id, revoked_at, revoked_at // 1000000 + ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+async def sync_revocation_list(driver: AsyncDriver, interval: float) -> None:
+    created_after = 0
+    cleaned_at = 0.0
+
+    while True:
+        try:
+            async with driver.session() as session:
+                revocation_repository = RevocationRepository(session)
+
+                records = await revocation_repository.get_revocations_created_after(created_after)
+                for record in records:
+                    if record["token_id"]:
+                        revocation_list.revoke_token(record["token_id"], record["expires_at"])
+                    else:
+                        revocation_list.revoke_user(record["user_id"], record["revoked_at"])
+
+                    created_after = max(created_after, record["created_at"] - REVOCATION_SYNC_OVERLAP_MS)
+
+                if time() - cleaned_at > ACCESS_TOKEN_EXPIRE_MINUTES * 60:
+                    await revocation_repository.delete_expired_revocations(int(time()))
+                    cleaned_at = time()
+
+        except (DriverError, Neo4jError) as exception:
+            logger.warning(f"Revocation list sync failed: {exception}")
+
+        await asyncio.sleep(interval)
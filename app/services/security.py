@@ -16,6 +16,9 @@ import bcrypt
 
 from passlib.context import CryptContext
 
+from app.core.metrics import password_hash_duration
+from app.core.timing import measure
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -24,8 +27,10 @@ def generate_salt() -> str:
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with measure("hash", password_hash_duration, "verify", span="bcrypt.verify"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    with measure("hash", password_hash_duration, "hash", span="bcrypt.hash"):
+        return pwd_context.hash(password)
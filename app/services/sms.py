@@ -12,22 +12,95 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from httpx import AsyncClient
+from enum import Enum
+from time import perf_counter
+from typing import List, Tuple
+
+from httpx import AsyncClient, HTTPError, Limits, Timeout
+from loguru import logger
 from pydantic import AnyHttpUrl
 
+from app.core.metrics import sms_request_duration
+from app.core.timing import add_phase
+from app.core.tracing import start_span
+
+
+class SmsResult(str, Enum):
+    delivered = "delivered"
+    rejected = "rejected"
+    failed = "failed"
 
-async def send_verify_code_to_phone(sms_service: AnyHttpUrl, phone: str, message: str) -> bool:
+
+def create_sms_client(
+        sms_service: AnyHttpUrl,
+        timeout: float,
+        connect_timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        http2: bool = False,
+) -> AsyncClient:
     headers = {
         "Content-Type": "application/json",
     }
+
+    return AsyncClient(
+        base_url=str(sms_service),
+        headers=headers,
+        timeout=Timeout(timeout, connect=connect_timeout),
+        limits=Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        http2=http2,
+    )
+
+
+async def send_verify_code_to_phone(client: AsyncClient, phone: str, message: str) -> SmsResult:
     request = {
         "phone": phone,
         "message": message,
     }
 
-    async with AsyncClient(base_url=sms_service, headers=headers) as client:
-        response = await client.post("/send", json=request)
+    return await _post(client, "send", request)
+
+
+async def send_verify_codes_to_phones(client: AsyncClient, messages: List[Tuple[str, str]]) -> SmsResult:
+    request = {
+        "messages": [{"phone": phone, "message": message} for phone, message in messages],
+    }
+
+    return await _post(client, "send_batch", request)
+
+
+async def _post(client: AsyncClient, endpoint: str, request: dict) -> SmsResult:
+    """Sends a request to the SMS service, a 4xx answer means the service refused the messages and retrying is pointless."""
+    outcome = "timeout"
+    started = perf_counter()
+
+    try:
+        with start_span(f"sms.{endpoint}", {"sms.endpoint": endpoint}, kind="CLIENT"):
+            response = await client.post(f"/{endpoint}", json=request)
         if response.status_code == 200:
-            return True
+            outcome = "success"
+        elif 400 <= response.status_code < 500:
+            logger.warning(f"SMS service rejected the request with status {response.status_code}")
+            outcome = "rejected"
+        else:
+            outcome = "error"
+    except HTTPError as exception:
+        logger.warning(f"SMS service request failed: {exception!r}")
+        outcome = "error"
+    finally:
+        elapsed = perf_counter() - started
+        sms_request_duration.observe(elapsed, endpoint, outcome)
+        add_phase("sms", elapsed)
+
+    if outcome == "success":
+        return SmsResult.delivered
+
+    if outcome == "rejected":
+        return SmsResult.rejected
 
-        return False
+    return SmsResult.failed
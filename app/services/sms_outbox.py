@@ -0,0 +1,194 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import asyncio
+
+from random import random
+from time import time
+from typing import Awaitable, Dict, List
+
+from httpx import AsyncClient
+from loguru import logger
+from neo4j import AsyncDriver, Record
+from neo4j.exceptions import DriverError, Neo4jError
+
+from app.core.metrics import sms_delivery_latency
+from app.core.tracing import current_traceparent, start_trace
+from app.database.repositories.sms_outbox_repository import SmsOutboxRepository
+from app.services.circuit_breaker import CircuitBreaker, CircuitState
+from app.services.sms import SmsResult, send_verify_code_to_phone, send_verify_codes_to_phones
+
+SMS_OUTBOX_MAINTENANCE_INTERVAL = 10.0
+
+
+class SmsOutbox(object):
+    """Delivers persisted SMS messages with a pool of workers, retrying failures with exponential backoff.
+
+    Messages the SMS service rejects with a 4xx are dropped, only timeouts, transport errors and 5xx trip the breaker.
+    """
+
+    def __init__(
+            self,
+            driver: AsyncDriver,
+            client: AsyncClient,
+            breaker: CircuitBreaker,
+            deadline: float,
+            workers: int,
+            batch_size: int,
+            poll_interval: float,
+            lease: float,
+            retry_base: float,
+            retry_max: float,
+    ) -> None:
+        self._driver = driver
+        self._client = client
+        self._deadline = deadline
+        self._workers = workers
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._lease = lease
+        self._retry_base = retry_base
+        self._retry_max = retry_max
+        self._wakeup = asyncio.Event()
+
+        self.breaker = breaker
+
+        self.queue_depth = 0
+        self.delivered = 0
+        self.retried = 0
+        self.rejected = 0
+        self.expired = 0
+
+    async def enqueue(self, repository: SmsOutboxRepository, key: str, phone: str, message: str, expires_at: int) -> None:
+        await repository.create_message(key, phone, message, time(), expires_at, current_traceparent())
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        await asyncio.gather(self._maintain(), *(self._work() for _ in range(self._workers)))
+
+    async def deliver(self) -> int:
+        if not self.breaker.allow():
+            return 0
+
+        probe = self.breaker.state != CircuitState.closed
+
+        try:
+            return await self._deliver(1 if probe else self._batch_size)
+        finally:
+            # A probe that ended without a recorded result must not keep the half-open breaker closed to everyone
+            if probe:
+                self.breaker.release()
+
+    async def _deliver(self, limit: int) -> int:
+        async with self._driver.session() as session:
+            repository = SmsOutboxRepository(session)
+
+            messages: List[Record] = await repository.claim_messages(time(), self._lease, limit)
+            if not messages:
+                return 0
+
+            results = await self._send(messages)
+
+            delivered_at = time()
+            delivered: List[str] = []
+            rejected: List[str] = []
+
+            for message in messages:
+                result = results[message["key"]]
+
+                if result == SmsResult.delivered:
+                    delivered.append(message["key"])
+                    sms_delivery_latency.observe(delivered_at - message["created_at"])
+                    continue
+
+                if result == SmsResult.rejected:
+                    rejected.append(message["key"])
+                    continue
+
+                attempts = message["attempts"] + 1
+                delay = min(self._retry_base * 2 ** message["attempts"], self._retry_max) * (0.5 + random() / 2)
+                await repository.retry_message(message["key"], attempts, delivered_at + delay)
+                self.retried += 1
+
+            if delivered or rejected:
+                await repository.delete_messages(delivered + rejected)
+                self.delivered += len(delivered)
+                self.rejected += len(rejected)
+
+        return len(messages)
+
+    async def _send(self, messages: List[Record]) -> Dict[str, SmsResult]:
+        if self._batch_size > 1 and len(messages) > 1:
+            with start_trace("sms.deliver_batch", kind="CONSUMER", attributes={"sms.messages": len(messages)}):
+                result = await self._call(send_verify_codes_to_phones(self._client, [(message["phone"], message["message"]) for message in messages]))
+
+            return {message["key"]: result for message in messages}
+
+        results = await asyncio.gather(*(self._deliver_message(message) for message in messages))
+        return {message["key"]: result for message, result in zip(messages, results)}
+
+    async def _deliver_message(self, message: Record) -> SmsResult:
+        with start_trace("sms.deliver", message["traceparent"], kind="CONSUMER"):
+            return await self._call(send_verify_code_to_phone(self._client, message["phone"], message["message"]))
+
+    async def _call(self, send: Awaitable[SmsResult]) -> SmsResult:
+        try:
+            result = await asyncio.wait_for(send, self._deadline)
+        except asyncio.TimeoutError:
+            logger.warning(f"SMS service did not answer within {self._deadline} seconds")
+            result = SmsResult.failed
+        except Exception as exception:
+            logger.warning(f"SMS service call failed: {exception!r}")
+            result = SmsResult.failed
+
+        if result == SmsResult.failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+        return result
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                if await self.deliver():
+                    continue
+            except (DriverError, Neo4jError) as exception:
+                logger.warning(f"SMS outbox delivery failed: {exception}")
+            except Exception as exception:
+                logger.error(f"SMS outbox delivery failed unexpectedly: {exception!r}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+
+    async def _maintain(self) -> None:
+        while True:
+            try:
+                async with self._driver.session() as session:
+                    repository = SmsOutboxRepository(session)
+
+                    expired = await repository.delete_expired_messages(time())
+                    if expired:
+                        logger.warning(f"SMS outbox dropped {expired} expired messages")
+
+                    self.expired += expired
+                    self.queue_depth = await repository.count_messages()
+            except (DriverError, Neo4jError) as exception:
+                logger.warning(f"SMS outbox maintenance failed: {exception}")
+
+            await asyncio.sleep(SMS_OUTBOX_MAINTENANCE_INTERVAL)
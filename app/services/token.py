@@ -12,36 +12,52 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from uuid import uuid4
 
 from jose import JWTError, jwt
 from pydantic import ValidationError
 
-from app.models.schemas.jwt import JWTMeta, JWTUser
+from app.core.metrics import jwt_duration
+from app.core.timing import measure
+from app.models.domain.user import User
+from app.models.schemas.jwt import JWTAccess, JWTMeta, JWTProfile, JWTUser
+from app.services.cache import TTLCache
 
 JWT_ACCESS_SUBJECT = "access"
 JWT_REFRESH_SUBJECT = "refresh"
 ALGORITHM = "RS512"
 ACCESS_TOKEN_EXPIRE_MINUTES = 5
 REFRESH_TOKEN_EXPIRE_DAYS = 365
+ACCESS_TOKEN_CACHE_SIZE = 10000
+
+access_token_cache = TTLCache(ACCESS_TOKEN_CACHE_SIZE)
+_access_token_cache_key = ""
 
 
 def create_token(data: dict, secret_key: str, subject: str, expires_delta: timedelta, access_token: str = "") -> str:
-    expire = datetime.utcnow() + expires_delta
+    issued = datetime.now(timezone.utc)
+    expire = issued + expires_delta
 
     to_encode = data.copy()
-    to_encode.update(JWTMeta(exp=expire, sub=subject).dict())
+    to_encode.update(JWTMeta(exp=expire, iat=issued, iat_us=int(issued.timestamp() * 1000000), jti=uuid4().hex, sub=subject).dict())
 
-    encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=ALGORITHM, access_token=access_token)
+    with measure("jwt", jwt_duration, "sign", span="jwt.sign"):
+        encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=ALGORITHM, access_token=access_token)
 
     return encoded_jwt
 
 
-def create_tokens_for_user(user_id: int, username: str, secret_key: str) -> (str, str):
+def create_tokens_for_user(user_id: int, username: str, secret_key: str, profile: User | None = None) -> (str, str):
     jwt_user = JWTUser(user_id=user_id, username=username)
 
+    access_data = jwt_user.__dict__.copy()
+    if profile:
+        access_data["profile"] = get_jwt_profile(profile).__dict__
+
     token_access = create_token(
-        jwt_user.__dict__, secret_key, JWT_ACCESS_SUBJECT, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        access_data, secret_key, JWT_ACCESS_SUBJECT, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
 
     token_refresh = create_token(
@@ -51,10 +67,37 @@ def create_tokens_for_user(user_id: int, username: str, secret_key: str) -> (str
     return token_access, token_refresh
 
 
-def get_user_id_from_access_token(access_token: str, secret_key: str) -> int | None:
+def get_jwt_profile(user: User) -> JWTProfile:
+    return JWTProfile(
+        phone=user.phone,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        gender=user.gender.value,
+        age=user.age,
+        country=user.country,
+        region=user.region,
+        image=str(user.image),
+        is_blocked=user.is_blocked,
+    )
+
+
+def get_access_token_payload(access_token: str, secret_key: str) -> JWTAccess | None:
+    global _access_token_cache_key
+
+    if secret_key != _access_token_cache_key:
+        access_token_cache.clear()
+        _access_token_cache_key = secret_key
+
+    token_digest = sha256(access_token.encode()).digest()
+
+    payload: JWTAccess | None = access_token_cache.get(token_digest)
+    if payload:
+        return payload
+
     try:
-        token_date = jwt.decode(access_token, secret_key, algorithms=[ALGORITHM], subject=JWT_ACCESS_SUBJECT)
-        user_data = JWTUser(**token_date)
+        with measure("jwt", jwt_duration, "verify", span="jwt.verify"):
+            token_date = jwt.decode(access_token, secret_key, algorithms=[ALGORITHM], subject=JWT_ACCESS_SUBJECT)
+        payload = JWTAccess(**token_date)
     except JWTError:
         return None
     except ValidationError:
@@ -62,13 +105,24 @@ def get_user_id_from_access_token(access_token: str, secret_key: str) -> int | N
     except ValueError:
         return None
 
-    user_id = user_data.user_id
+    access_token_cache.set(token_digest, payload, payload.exp)
+
+    return payload
+
+
+def get_user_id_from_access_token(access_token: str, secret_key: str) -> int | None:
+    payload = get_access_token_payload(access_token, secret_key)
+    if not payload:
+        return None
+
+    user_id = payload.user_id
     return user_id
 
 
 def get_user_id_from_refresh_token(access_token: str, refresh_token: str, secret_key: str) -> int | None:
     try:
-        token_date = jwt.decode(refresh_token, secret_key, algorithms=[ALGORITHM], subject=JWT_REFRESH_SUBJECT, access_token=access_token)
+        with measure("jwt", jwt_duration, "verify", span="jwt.verify"):
+            token_date = jwt.decode(refresh_token, secret_key, algorithms=[ALGORITHM], subject=JWT_REFRESH_SUBJECT, access_token=access_token)
         user_data = JWTUser(**token_date)
     except JWTError:
         return None
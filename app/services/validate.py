@@ -12,23 +12,94 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from functools import lru_cache
+from time import monotonic
+from typing import Tuple
+
 from loguru import logger
-from phonenumbers import NumberParseException, parse, is_possible_number, is_valid_number
 
+PHONE_CACHE_SIZE = 10000
+INVALID_PHONE_LOG_INTERVAL = 60.0
+
+
+class ThrottledLogger(object):
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._logged_at = -interval
+        self._suppressed = 0
+
+    def warning(self, message: str) -> None:
+        now = monotonic()
+        if now - self._logged_at < self._interval:
+            self._suppressed += 1
+            return
+
+        if self._suppressed:
+            message = f"{message} ({self._suppressed} similar messages suppressed)"
+
+        logger.warning(message)
+
+        self._logged_at = now
+        self._suppressed = 0
+
+
+invalid_phone_logger = ThrottledLogger(INVALID_PHONE_LOG_INTERVAL)
+
+
+@lru_cache(maxsize=None)
+def _get_country_codes(regions: Tuple[str, ...]) -> Tuple[str, ...]:
+    from phonenumbers.phonenumberutil import country_code_for_region
+
+    country_codes = (country_code_for_region(region) for region in regions)
+
+    return tuple(str(country_code) for country_code in country_codes if country_code)
+
+
+def _has_country_code(phone_number: str, country_codes: Tuple[str, ...]) -> bool:
+    if not phone_number.lstrip().startswith("+"):
+        return True
+
+    digits = "".join(symbol for symbol in phone_number if symbol.isdigit())
+
+    return digits.startswith(country_codes)
+
+
+@lru_cache(maxsize=PHONE_CACHE_SIZE)
+def normalize_phone(phone_number: str, regions: Tuple[str, ...] = ()) -> str | None:
+    from phonenumbers.phonenumberutil import (
+        NumberParseException,
+        PhoneNumberFormat,
+        format_number,
+        is_possible_number,
+        is_valid_number,
+        parse,
+        region_code_for_number,
+    )
+
+    if regions and not _has_country_code(phone_number, _get_country_codes(regions)):
+        invalid_phone_logger.warning(f"Phone number {phone_number} is outside of supported regions")
+        return None
 
-def check_phone_is_valid(phone_number: str) -> bool:
     try:
         phone = parse(phone_number, None)
     except NumberParseException:
-        logger.warning(f"Phone number {phone_number} parser error")
-        return False
+        invalid_phone_logger.warning(f"Phone number {phone_number} parser error")
+        return None
 
     if not is_possible_number(phone):
-        logger.warning(f"Phone number {phone_number} is impossible number")
-        return False
+        invalid_phone_logger.warning(f"Phone number {phone_number} is impossible number")
+        return None
 
     if not is_valid_number(phone):
-        logger.warning(f"Phone number {phone_number} is invalid number")
-        return False
+        invalid_phone_logger.warning(f"Phone number {phone_number} is invalid number")
+        return None
+
+    if regions and region_code_for_number(phone) not in regions:
+        invalid_phone_logger.warning(f"Phone number {phone_number} is outside of supported regions")
+        return None
+
+    return format_number(phone, PhoneNumberFormat.E164)
+
 
-    return True
+def check_phone_is_valid(phone_number: str, regions: Tuple[str, ...] = ()) -> bool:
+    return normalize_phone(phone_number, regions) is not None
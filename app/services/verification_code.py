@@ -12,35 +12,40 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from loguru import logger
-from pyotp import TOTP, random_base32
-from neo4j import AsyncResult, Record
+from hmac import compare_digest
+from secrets import randbelow, token_hex
+from time import time
 
 from app.models.domain.verification_code import VerificationCode
+from app.services.lock import KeyedLock
 
-AUTH_ISSUER = "rideonline_auth"
+VERIFICATION_CODE_DIGITS = 6
+VERIFICATION_TOKEN_BYTES = 16
 
+# Per process in every configuration, workers sharing Redis are only kept apart by the verification code rate limit
+verification_code_lock = KeyedLock()
 
-def create_verification_code(interval: int) -> VerificationCode:
-    secret: str = random_base32()
-    verification_token: str = random_base32()
 
-    otp = TOTP(secret + verification_token, issuer=AUTH_ISSUER, interval=interval)
-
-    verification_code = otp.now()
+def create_verification_code(timeout: int) -> VerificationCode:
+    issued_at = int(time())
 
     return VerificationCode(
-        secret=secret,
-        token=verification_token,
-        code=verification_code,
+        token=token_hex(VERIFICATION_TOKEN_BYTES),
+        code=str(randbelow(10 ** VERIFICATION_CODE_DIGITS)).zfill(VERIFICATION_CODE_DIGITS),
+        issued_at=issued_at,
+        expires_at=issued_at + timeout,
     )
 
 
-def check_verification_code(secret: str, verification_token: str, verification_code: str, interval: int) -> bool:
-    otp = TOTP(secret + verification_token, issuer=AUTH_ISSUER, interval=interval)
+def check_verification_code_is_active(verification_code: VerificationCode) -> bool:
+    return verification_code.expires_at > time()
+
+
+def check_verification_code(verification_code: VerificationCode, token: str, code: str) -> bool:
+    if not check_verification_code_is_active(verification_code):
+        return False
 
-    is_valid = otp.verify(verification_code)
-    if is_valid:
-        return True
+    is_token_valid = compare_digest(verification_code.token.encode(), token.encode())
+    is_code_valid = compare_digest(verification_code.code.encode(), code.encode())
 
-    return False
+    return is_token_valid and is_code_valid
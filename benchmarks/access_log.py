@@ -0,0 +1,98 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Measure logging overhead per request.
+
+Emits uvicorn access log records through the previous synchronous stderr
+pipeline and through the queued, JSON and sampled configurations, writing to
+a temporary file, and reports the time each request spends in logging:
+
+    python -m benchmarks.access_log --number 20000
+"""
+
+import argparse
+import logging
+import tempfile
+
+from time import perf_counter
+from types import FrameType
+from typing import Callable, TextIO, cast
+
+from loguru import logger
+
+from app.core.logging import configure_logging
+
+LOGGERS = ("uvicorn.asgi", "uvicorn.access")
+
+
+class PreviousInterceptHandler(logging.Handler):
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = str(record.levelno)
+
+        frame, depth = logging.currentframe(), 2
+        while frame.f_code.co_filename == logging.__file__:
+            frame = cast(FrameType, frame.f_back)
+            depth += 1
+
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+
+def configure_previous(sink: TextIO) -> None:
+    configure_logging(logging.INFO, LOGGERS, sink=sink)
+
+    for logger_name in LOGGERS:
+        logging.getLogger(logger_name).handlers = [PreviousInterceptHandler(level=logging.INFO)]
+
+
+MODES = {
+    "previous": configure_previous,
+    "sync": lambda sink: configure_logging(logging.INFO, LOGGERS, sink=sink),
+    "queued": lambda sink: configure_logging(logging.INFO, LOGGERS, enqueue=True, sink=sink),
+    "queued json": lambda sink: configure_logging(logging.INFO, LOGGERS, json=True, enqueue=True, sink=sink),
+    "queued json 10%": lambda sink: configure_logging(logging.INFO, LOGGERS, json=True, enqueue=True, access_log_sample_rate=0.1, sink=sink),
+}
+
+
+def measure(configure: Callable[[TextIO], None], number: int) -> float:
+    access_logger = logging.getLogger("uvicorn.access")
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+
+    with tempfile.TemporaryFile("w", buffering=1) as sink:
+        configure(sink)
+
+        started = perf_counter()
+        for _ in range(number):
+            access_logger.info('%s - "%s %s HTTP/%s" %d', "127.0.0.1:50000", "POST", "/api/v2/auth/login", "1.1", 200)
+        elapsed = perf_counter() - started
+
+        logger.remove()
+
+    return elapsed / number * 1000000
+
+
+def main(number: int) -> None:
+    for name, configure in MODES.items():
+        print(f"{name:>16}: {measure(configure, number):8.1f} us per request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    arguments = parser.parse_args()
+
+    main(arguments.number)
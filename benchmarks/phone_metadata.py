@@ -0,0 +1,90 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Compare validating phones with and without the region prefilter.
+
+Each variant runs in a fresh interpreter and reports the total time to import
+the validator and validate a mix of local and foreign numbers, resident memory
+growth and the number of region metadata modules loaded. The import and the
+first validations are timed together because phonenumbers loads region
+metadata on demand either way, so splitting them only moves the cost between
+the two columns. loguru is imported up front in both, since every worker loads
+it anyway:
+
+    python -m benchmarks.phone_metadata --regions BY RU
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+PHONES = [
+    "+375257654321", "+79161234567", "+4915123456789", "+14155552671", "+447911123456",
+    "+33612345678", "+8613812345678", "+819012345678", "+5511912345678", "+919812345678",
+    "+61412345678", "+27821234567", "+77012345678", "+380501234567", "+48512345678",
+]
+
+SCRIPT = """
+import json, resource, sys
+from time import perf_counter
+
+import loguru
+
+phones, regions = json.loads(sys.argv[1]), tuple(json.loads(sys.argv[2]))
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+started = perf_counter()
+if regions:
+    from app.services.validate import normalize_phone
+    validate = lambda phone: normalize_phone(phone, regions)
+else:
+    import phonenumbers
+    validate = lambda phone: phonenumbers.is_valid_number(phonenumbers.parse(phone, None))
+
+for phone in phones:
+    validate(phone)
+validated = perf_counter()
+
+print(json.dumps({
+    "total_ms": (validated - started) * 1000,
+    "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss,
+    "regions": len([name for name in sys.modules if name.startswith("phonenumbers.data.region_")]),
+}))
+"""
+
+
+def run(regions: list) -> dict:
+    output = subprocess.check_output([sys.executable, "-c", SCRIPT, json.dumps(PHONES), json.dumps(regions)], stderr=subprocess.DEVNULL)
+    return json.loads(output)
+
+
+def main(regions: list, repeat: int) -> None:
+    for name, variant in (("full import", []), ("regions " + ",".join(regions), regions)):
+        results = [run(variant) for _ in range(repeat)]
+        best = {key: min(result[key] for result in results) for key in results[0]}
+
+        print(
+            f"{name:>16}: import and validate {best['total_ms']:6.1f} ms  "
+            f"rss +{best['rss_kb']:6d} KB  region modules {best['regions']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--regions", nargs="+", default=["BY", "RU"])
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+
+    main(arguments.regions, arguments.repeat)
@@ -0,0 +1,108 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Measure response serialization per endpoint shape.
+
+Runs FastAPI's response serialization and rendering for the payloads the
+routes return, once through an untyped wrapper rendered by JSONResponse and
+once through the typed WrapperResponse rendered by ORJSONResponse:
+
+    python -m benchmarks.serialization --number 20000
+"""
+
+import argparse
+import asyncio
+import typing
+
+from time import perf_counter
+from typing import Any, Callable, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models.common import BaseAppModel
+from app.models.domain.token import Token
+from app.models.domain.user import Gender, UserInDB
+from app.models.schemas.introspection import TokenIntrospection, TokensIntrospectResponse
+from app.models.schemas.phone import PhoneTokenResponse
+from app.models.schemas.user import UserResponse, UserWithTokenResponse
+from app.models.schemas.wrapper import WrapperResponse
+
+
+class UntypedWrapperResponse(BaseAppModel):
+    success: bool = True
+    payload: typing.Any = None
+    message: str = ""
+
+
+user = UserInDB(
+    id=1,
+    phone="+375257654321",
+    username="username",
+    first_name="Test",
+    last_name="User",
+    gender=Gender.male,
+    country="Belarus",
+    region="Minsk",
+    salt="salt",
+    password="password",
+)
+token = Token(token_access="a" * 600, token_refresh="r" * 300)
+
+ENDPOINTS = {
+    "auth:verification": PhoneTokenResponse(verification_token="0" * 32),
+    "auth:login": UserWithTokenResponse(user=user, token=token),
+    "users:get-current-user": UserResponse(user=user),
+    "tokens:introspect": TokensIntrospectResponse(
+        tokens=[TokenIntrospection(active=True, user_id=index, username="username", expires_at=0, is_blocked=False) for index in range(100)]
+    ),
+    "exists:username": None,
+}
+
+
+def create_render(wrapper: Type[BaseAppModel], response_class: Type[Response]) -> Callable[[Any], Any]:
+    field = create_response_field(name="Response", type_=wrapper, mode="serialization")
+
+    async def render(payload: Any) -> bytes:
+        content = await serialize_response(field=field, response_content=wrapper(payload=payload))
+        return response_class(content).body
+
+    return render
+
+
+async def measure(render: Callable[[Any], Any], payload: Any, number: int) -> float:
+    started = perf_counter()
+    for _ in range(number):
+        await render(payload)
+
+    return (perf_counter() - started) / number * 1000000
+
+
+async def main(number: int) -> None:
+    for name, payload in ENDPOINTS.items():
+        payload_type = type(payload) if payload is not None else None
+
+        untyped = await measure(create_render(UntypedWrapperResponse, JSONResponse), payload, number)
+        typed = await measure(create_render(WrapperResponse[payload_type], ORJSONResponse), payload, number)
+
+        print(f"{name:>24}: {untyped:8.1f} us -> {typed:8.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.number))
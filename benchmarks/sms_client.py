@@ -0,0 +1,99 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Compare a client per SMS with the pooled application client.
+
+Starts a local stub of the SMS service and sends the same number of messages
+both ways, printing latency percentiles and throughput:
+
+    python -m benchmarks.sms_client --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+
+from statistics import quantiles
+from time import perf_counter
+from typing import Awaitable, Callable, List
+
+from httpx import AsyncClient
+
+from app.services.sms import create_sms_client, send_verify_code_to_phone
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}"
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                name, _, value = line.partition(b":")
+                if name.lower() == b"content-length":
+                    length = int(value)
+
+            await reader.readexactly(length)
+            writer.write(RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def send_with_new_client(base_url: str) -> bool:
+    async with AsyncClient(base_url=base_url, headers={"Content-Type": "application/json"}) as client:
+        response = await client.post("/send", json={"phone": "+375257654321", "message": "Code: 123456"})
+        return response.status_code == 200
+
+
+async def run(name: str, send: Callable[[], Awaitable[bool]], requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def timed_send() -> None:
+        async with semaphore:
+            started = perf_counter()
+            assert await send()
+            latencies.append(perf_counter() - started)
+
+    started = perf_counter()
+    await asyncio.gather(*(timed_send() for _ in range(requests)))
+    elapsed = perf_counter() - started
+
+    p50, p99 = (quantiles(latencies, n=100)[i] for i in (49, 98))
+    print(f"{name:>12}: {requests / elapsed:8.0f} req/s  p50 {p50 * 1000:6.2f} ms  p99 {p99 * 1000:6.2f} ms")
+
+
+async def main(requests: int, concurrency: int) -> None:
+    server = await asyncio.start_server(handle_connection, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    base_url = f"http://{host}:{port}/api/v1"
+
+    async with server:
+        await run("per request", lambda: send_with_new_client(base_url), requests, concurrency)
+
+        client = create_sms_client(base_url, 5.0, 2.0, concurrency, concurrency, 30.0)
+        async with client:
+            await run("pooled", lambda: send_verify_code_to_phone(client, "+375257654321", "Code: 123456"), requests, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    arguments = parser.parse_args()
+
+    asyncio.run(main(arguments.requests, arguments.concurrency))
@@ -0,0 +1,153 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Measure throughput of the production server as workers are added.
+
+Starts python -m app with 1, 2, 4... workers up to the CPU count and sends
+forward auth requests, each with a token not seen before, so that every
+request verifies an RS512 signature. Needs the same environment as the
+service itself (keys, Neo4j and the SMS service settings):
+
+    python -m benchmarks.workers --requests 20000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from time import perf_counter, sleep
+from typing import List
+
+from httpx import AsyncClient, HTTPError
+from jose import jwk
+
+from app.core.config import get_app_settings
+from app.models.schemas.jwt import JWTUser
+from app.services.token import ALGORITHM, JWT_ACCESS_SUBJECT, create_token
+
+PATH = "/api/v2/forward_auth"
+
+
+def create_tokens(user_ids: range) -> List[str]:
+    # Parse the key once, signing with the PEM string parses it for every token
+    key = jwk.construct(get_app_settings().private_key, ALGORITHM)
+
+    return [
+        create_token(JWTUser(user_id=user_id, username=f"user{user_id}").__dict__, key, JWT_ACCESS_SUBJECT, timedelta(hours=1))
+        for user_id in user_ids
+    ]
+
+
+def create_headers(count: int) -> List[dict]:
+    settings = get_app_settings()
+    chunks = [range(start, min(start + 1000, count)) for start in range(0, count, 1000)]
+
+    with ProcessPoolExecutor() as executor:
+        tokens = [token for chunk in executor.map(create_tokens, chunks) for token in chunk]
+
+    return [{"Authorization": f"{settings.jwt_token_prefix} {token}"} for token in tokens]
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    environment = {**os.environ, "SERVER_WORKERS": str(workers), "SERVER_PORT": str(port), "ACCESS_LOG_SAMPLE_RATE": "0"}
+    server = subprocess.Popen([sys.executable, "-m", "app"], env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    for _ in range(600):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                # Give the remaining workers time to finish their startup
+                sleep(2.0)
+                return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            sleep(0.1)
+
+    server.terminate()
+    raise RuntimeError("Server did not start")
+
+
+async def send_requests(base_url: str, headers: List[dict], concurrency: int) -> float:
+    queue = iter(headers)
+
+    async def send(client: AsyncClient) -> None:
+        for request_headers in queue:
+            try:
+                response = await client.get(PATH, headers=request_headers)
+            except HTTPError:
+                continue
+
+            if response.status_code != 200:
+                raise RuntimeError(f"Unexpected status {response.status_code}")
+
+    async with AsyncClient(base_url=base_url, timeout=30.0) as client:
+        started = perf_counter()
+        await asyncio.gather(*(send(client) for _ in range(concurrency)))
+
+    return perf_counter() - started
+
+
+def run_client(base_url: str, headers: List[dict], concurrency: int) -> float:
+    return asyncio.run(send_requests(base_url, headers, concurrency))
+
+
+def measure(workers: int, headers: List[dict], concurrency: int, clients: int) -> float:
+    port = get_free_port()
+    server = start_server(workers, port)
+
+    try:
+        # Several client processes, so that the load generator is not the bottleneck
+        with ProcessPoolExecutor(clients) as executor:
+            parts = [headers[index::clients] for index in range(clients)]
+            elapsed = max(executor.map(run_client, [f"http://127.0.0.1:{port}"] * clients, parts, [concurrency // clients or 1] * clients))
+    finally:
+        server.terminate()
+        server.wait()
+
+    return len(headers) / elapsed
+
+
+def main(requests: int, concurrency: int, clients: int) -> None:
+    headers = create_headers(requests)
+
+    workers, cpu_count = 1, os.cpu_count() or 1
+    baseline = None
+
+    while workers <= cpu_count:
+        throughput = measure(workers, headers, concurrency, clients)
+        baseline = baseline or throughput
+
+        print(f"{workers:>3} workers: {throughput:8.0f} requests/s, {throughput / baseline:4.1f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=4)
+    arguments = parser.parse_args()
+
+    main(arguments.requests, arguments.concurrency, arguments.clients)
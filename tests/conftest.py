@@ -20,9 +20,9 @@ from httpx import AsyncClient
 from neo4j import AsyncDriver, AsyncSession, AsyncTransaction
 
 from app.core.settings.app import AppSettings
-from app.database.repositories.phone_repository import PhoneRepository
 from app.database.repositories.token_repository import TokenRepository
 from app.database.repositories.user_repository import UserRepository
+from app.database.repositories.verification_code_repository import VerificationCodeRepository
 from app.models.domain.user import Gender, User
 from app.models.domain.verification_code import VerificationCode
 from app.services.verification_code import create_verification_code
@@ -87,8 +87,14 @@ def verification_code(settings: AppSettings) -> VerificationCode:
     return verification_code
 
 
+@pytest.fixture
+def verification_code_repository(settings: AppSettings) -> VerificationCodeRepository:
+    from app.database.key_value_store import get_key_value_store
+    return VerificationCodeRepository(get_key_value_store(settings.redis_url))
+
+
 @pytest_asyncio.fixture
-async def test_user(verification_code: VerificationCode, session: AsyncSession) -> User:
+async def test_user(session: AsyncSession) -> User:
     phone = "+375257654321"
     username = "username"
     password = "password"
@@ -97,9 +103,6 @@ async def test_user(verification_code: VerificationCode, session: AsyncSession)
     age = 18
     gender = Gender.male
 
-    phone_repository = PhoneRepository(session)
-    await phone_repository.update_verification_code_by_phone(phone, verification_code.secret, verification_code.token, verification_code.code)
-
     user_repository = UserRepository(session)
     user = await user_repository.create_user(phone, username, password, first_name=first_name, last_name=last_name, age=age, gender=gender)
     if not user:
@@ -109,14 +112,11 @@ async def test_user(verification_code: VerificationCode, session: AsyncSession)
 
 
 @pytest_asyncio.fixture
-async def test_other_user(verification_code: VerificationCode, session: AsyncSession) -> User:
+async def test_other_user(session: AsyncSession) -> User:
     phone = "+375257654322"
     username = "other_username"
     password = "password"
 
-    phone_repository = PhoneRepository(session)
-    await phone_repository.update_verification_code_by_phone(phone, verification_code.secret, verification_code.token, verification_code.code)
-
     user_repository = UserRepository(session)
     user = await user_repository.create_user(phone, username, password)
     if not user:
@@ -30,3 +30,17 @@ async def test_frw_validation_error_format(app: FastAPI):
     result = WrapperResponse.model_validate(response.json())
     assert not result.success
     assert "Not Found" in result.message
+
+
+@pytest.mark.asyncio
+async def test_error_message_is_localized_by_accept_language(app: FastAPI):
+    from app.resources.strings_ru import StringsRU
+
+    async with AsyncClient(base_url="http://localhost:12345", app=app) as client:
+        response = await client.get(app.url_path_for("users:get-current-user"), headers={"Accept-Language": "de;q=1.0, ru-RU, ru;q=0.9"})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    result = WrapperResponse.model_validate(response.json())
+    assert not result.success
+    assert result.message == StringsRU.AUTHENTICATION_REQUIRED
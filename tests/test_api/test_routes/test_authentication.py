@@ -16,6 +16,10 @@ import pytest
 
 from fastapi import status
 
+from app.models.domain.user import User
+from app.models.schemas.user import UserResponse
+from app.models.schemas.wrapper import WrapperResponse
+from app.services.revocation import revocation_list
 from app.services.token import create_tokens_for_user
 
 
@@ -41,3 +45,55 @@ async def test_unable_to_login_when_user_does_not_exist_any_more(settings, initi
         headers={"Authorization": f"{authorization_prefix} {token_access}"},
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_user_can_retrieve_own_profile_from_token_claims(monkeypatch, settings, app, client, authorization_prefix):
+    monkeypatch.setattr(settings, "jwt_claims_only", True)
+    app.state.session = None
+
+    user = User(id=9999999999999, phone="+375257654321", username="test_user", first_name="Test")
+    token_access, _ = create_tokens_for_user(user.id, user.username, settings.private_key, user)
+
+    response = await client.get(
+        app.url_path_for("users:get-current-user"),
+        headers={"Authorization": f"{authorization_prefix} {token_access}"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    result = WrapperResponse.model_validate(response.json())
+    user_profile = UserResponse.model_validate(result.payload)
+    assert user_profile.user.id == user.id
+    assert user_profile.user.first_name == user.first_name
+
+
+@pytest.mark.asyncio
+async def test_blocked_user_can_not_login_with_token_claims(monkeypatch, settings, app, client, authorization_prefix):
+    monkeypatch.setattr(settings, "jwt_claims_only", True)
+    app.state.session = None
+
+    user = User(id=9999999999999, phone="+375257654321", username="test_user", is_blocked=True)
+    token_access, _ = create_tokens_for_user(user.id, user.username, settings.private_key, user)
+
+    response = await client.get(
+        app.url_path_for("users:get-current-user"),
+        headers={"Authorization": f"{authorization_prefix} {token_access}"},
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_unable_to_login_with_revoked_token(monkeypatch, settings, app, client, authorization_prefix):
+    monkeypatch.setattr(settings, "jwt_claims_only", True)
+    app.state.session = None
+
+    user = User(id=9999999999998, phone="+375257654321", username="test_user")
+    token_access, _ = create_tokens_for_user(user.id, user.username, settings.private_key, user)
+
+    revocation_list.revoke_user(user.id)
+
+    response = await client.get(
+        app.url_path_for("users:get-current-user"),
+        headers={"Authorization": f"{authorization_prefix} {token_access}"},
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -17,17 +17,15 @@ import pytest
 from fastapi import FastAPI, status
 from httpx import AsyncClient
 
-from app.database.repositories.phone_repository import PhoneRepository
 from app.models.domain.user import User
 
 
 @pytest.mark.asyncio
-async def test_user_success_change_password_without_auth(initialized_app, client, session, test_user, verification_code):
+async def test_user_success_change_password_without_auth(initialized_app, client, session, test_user, verification_code, verification_code_repository):
     phone = "+375257654321"
     password = "password"
 
-    phone_repository = PhoneRepository(session)
-    await phone_repository.update_verification_code_by_phone(phone, verification_code.secret, verification_code.token, verification_code.code)
+    await verification_code_repository.update_verification_code_by_phone(phone, verification_code)
 
     change_password_json = {
         "phone": phone,
@@ -42,12 +40,11 @@ async def test_user_success_change_password_without_auth(initialized_app, client
 
 
 @pytest.mark.asyncio
-async def test_unregistered_user_can_not_change_password_without_auth(initialized_app, client, session, verification_code):
+async def test_unregistered_user_can_not_change_password_without_auth(initialized_app, client, session, verification_code, verification_code_repository):
     phone = "+375257654321"
     password = "password"
 
-    phone_repository = PhoneRepository(session)
-    await phone_repository.update_verification_code_by_phone(phone, verification_code.secret, verification_code.token, verification_code.code)
+    await verification_code_repository.update_verification_code_by_phone(phone, verification_code)
 
     change_password_json = {
         "phone": phone,
@@ -0,0 +1,60 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+
+from fastapi import status
+
+from app.services.revocation import revocation_list
+from app.services.token import create_tokens_for_user
+
+
+@pytest.mark.asyncio
+async def test_forward_auth_returns_user_headers(settings, app, client, authorization_prefix):
+    app.state.session = None
+
+    token_access, _ = create_tokens_for_user(1, "username", settings.private_key)
+
+    for _ in range(2):
+        response = await client.get(
+            app.url_path_for("auth:forward-auth"),
+            headers={"Authorization": f"{authorization_prefix} {token_access}"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["X-User-Id"] == "1"
+        assert response.headers["X-Username"] == "username"
+        assert not response.content
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("authorization", ("", "value", "Token value", "Bearer value"))
+async def test_forward_auth_rejects_wrong_authorization(app, client, authorization):
+    response = await client.get(app.url_path_for("auth:forward-auth"), headers={"Authorization": authorization})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert "X-User-Id" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_forward_auth_rejects_revoked_token(settings, app, client, authorization_prefix):
+    token_access, _ = create_tokens_for_user(3, "username", settings.private_key)
+    headers = {"Authorization": f"{authorization_prefix} {token_access}"}
+
+    response = await client.get(app.url_path_for("auth:forward-auth"), headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    revocation_list.revoke_user(3)
+
+    response = await client.get(app.url_path_for("auth:forward-auth"), headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
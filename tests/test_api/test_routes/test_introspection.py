@@ -0,0 +1,75 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+
+from fastapi import status
+
+from app.models.schemas.introspection import TokensIntrospectResponse
+from app.models.schemas.wrapper import WrapperResponse
+
+INTERNAL_API_KEY = "secret"
+
+
+@pytest.fixture
+def internal_headers(monkeypatch, settings) -> dict:
+    monkeypatch.setattr(settings, "internal_api_key", INTERNAL_API_KEY)
+    return {"X-Internal-Api-Key": INTERNAL_API_KEY}
+
+
+@pytest.mark.asyncio
+async def test_introspect_valid_and_invalid_tokens(initialized_app, client, test_user, tokens, internal_headers):
+    token_access, _ = tokens
+
+    response = await client.post(
+        initialized_app.url_path_for("tokens:introspect"),
+        json={"tokens": [token_access, "invalid token"]},
+        headers=internal_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    result = WrapperResponse.model_validate(response.json())
+    introspection = TokensIntrospectResponse.model_validate(result.payload)
+
+    valid, invalid = introspection.tokens
+    assert valid.active
+    assert valid.user_id == test_user.id
+    assert not valid.is_blocked
+    assert not invalid.active
+
+
+@pytest.mark.asyncio
+async def test_introspect_invalid_tokens_without_database(app, client, internal_headers):
+    app.state.session = None
+
+    response = await client.post(app.url_path_for("tokens:introspect"), json={"tokens": ["invalid token"]}, headers=internal_headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    result = WrapperResponse.model_validate(response.json())
+    introspection = TokensIntrospectResponse.model_validate(result.payload)
+    assert not introspection.tokens[0].active
+
+
+@pytest.mark.asyncio
+async def test_introspect_requires_internal_api_key(app, client, internal_headers):
+    response = await client.post(app.url_path_for("tokens:introspect"), json={"tokens": ["invalid token"]})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_introspect_is_closed_without_internal_api_key(monkeypatch, settings, app, client):
+    monkeypatch.setattr(settings, "internal_api_key", "")
+
+    response = await client.post(app.url_path_for("tokens:introspect"), json={"tokens": ["invalid token"]}, headers={"X-Internal-Api-Key": ""})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -46,3 +46,23 @@ async def test_user_login_when_credential_part_does_not_match(
     response = await client.post(initialized_app.url_path_for("auth:login"), json=login_json)
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_user_login_is_rate_limited(
+        monkeypatch,
+        settings,
+        initialized_app: FastAPI,
+        client: AsyncClient,
+        test_user: User,
+) -> None:
+    monkeypatch.setattr(settings, "login_attempts_per_username", 1)
+
+    login_json = {"username": "rate_limited_username", "password": "password"}
+
+    response = await client.post(initialized_app.url_path_for("auth:login"), json=login_json)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = await client.post(initialized_app.url_path_for("auth:login"), json=login_json)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) > 0
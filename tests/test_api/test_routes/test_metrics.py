@@ -0,0 +1,61 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+
+import pytest
+
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+
+
+INTERNAL_API_KEY = "secret"
+
+
+@pytest.fixture
+def metrics_app(monkeypatch, settings) -> FastAPI:
+    from app.app import get_application
+
+    monkeypatch.setattr(settings, "metrics_enabled", True)
+    monkeypatch.setattr(settings, "internal_api_key", INTERNAL_API_KEY)
+    return get_application()
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_disabled_by_default(client: AsyncClient):
+    response = await client.get("/metrics")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_metrics_require_internal_api_key(metrics_app: FastAPI):
+    async with AsyncClient(app=metrics_app, base_url="http://localhost:12345") as client:
+        response = await client.get(metrics_app.url_path_for("metrics"))
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_metrics_include_request_latency_by_route_name(metrics_app: FastAPI):
+    metrics_app.state.session = None
+
+    async with AsyncClient(app=metrics_app, base_url="http://localhost:12345") as client:
+        await client.get(metrics_app.url_path_for("users:get-current-user"))
+        response = await client.get(metrics_app.url_path_for("metrics"), headers={"X-Internal-Api-Key": INTERNAL_API_KEY})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert f'http_request_duration_seconds_count{{route="users:get-current-user",method="GET",status="401",worker="{os.getpid()}"}}' in response.text
+    assert "# TYPE cache_hits_total counter" in response.text
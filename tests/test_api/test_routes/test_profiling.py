@@ -0,0 +1,81 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+
+from types import SimpleNamespace
+
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+
+from app.services.profiler import _fold_stack
+
+
+@pytest.fixture
+def profiling_app(monkeypatch, settings) -> FastAPI:
+    from app.app import get_application
+
+    monkeypatch.setattr(settings, "profiling_key", "secret")
+    return get_application()
+
+
+@pytest.mark.asyncio
+async def test_profiling_is_disabled_by_default(client: AsyncClient):
+    response = await client.get("/debug/profile")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_profiling_requires_key(profiling_app: FastAPI):
+    async with AsyncClient(app=profiling_app, base_url="http://localhost:12345") as client:
+        response = await client.get(profiling_app.url_path_for("profiling:cpu"), params={"seconds": 0.01})
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_returns_folded_stacks(profiling_app: FastAPI):
+    async with AsyncClient(app=profiling_app, base_url="http://localhost:12345", headers={"X-Profiling-Key": "secret"}) as client:
+        response = await client.get(profiling_app.url_path_for("profiling:cpu"), params={"seconds": 0.05, "interval": 0.005})
+
+    assert response.status_code == status.HTTP_200_OK
+
+    stacks = dict(line.rsplit(" ", 1) for line in response.text.splitlines())
+    assert any(stack.startswith("MainThread;") for stack in stacks)
+    assert all(int(count) > 0 for count in stacks.values())
+
+
+@pytest.mark.asyncio
+async def test_memory_growth_is_reported_between_snapshots(profiling_app: FastAPI):
+    async with AsyncClient(app=profiling_app, base_url="http://localhost:12345", headers={"X-Profiling-Key": "secret"}) as client:
+        response = await client.get(profiling_app.url_path_for("profiling:memory"))
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+        response = await client.post(profiling_app.url_path_for("profiling:memory-start"))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = await client.get(profiling_app.url_path_for("profiling:memory"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.text.startswith("pid ")
+
+        response = await client.post(profiling_app.url_path_for("profiling:memory-stop"))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_folded_stack_falls_back_to_code_name():
+    caller = SimpleNamespace(f_globals={"__name__": "app.module"}, f_code=SimpleNamespace(co_name="caller"), f_back=None)
+    frame = SimpleNamespace(f_globals={"__name__": "app.module"}, f_code=SimpleNamespace(co_name="handler"), f_back=caller)
+
+    assert _fold_stack("MainThread", frame) == "MainThread;app.module.caller;app.module.handler"
@@ -17,20 +17,18 @@ import pytest
 from fastapi import status
 
 from app.database.repositories.user_repository import UserRepository
-from app.database.repositories.phone_repository import PhoneRepository
 from app.models.domain.verification_code import VerificationCode
 from app.models.schemas.wrapper import WrapperResponse
 from app.services.verification_code import create_verification_code
 
 
 @pytest.mark.asyncio
-async def test_user_success_registration(initialized_app, client, session, verification_code):
+async def test_user_success_registration(initialized_app, client, session, verification_code, verification_code_repository):
     phone = "+375257654321"
     username = "username"
     password = "password"
 
-    phone_repository = PhoneRepository(session)
-    await phone_repository.update_verification_code_by_phone(phone, verification_code.secret, verification_code.token, verification_code.code)
+    await verification_code_repository.update_verification_code_by_phone(phone, verification_code)
 
     registration_json = {
         "phone": phone,
@@ -55,11 +53,10 @@ async def test_user_success_registration(initialized_app, client, session, verif
 
 
 @pytest.mark.asyncio
-async def test_failed_user_registration_when_username_are_taken(initialized_app, client, session, test_user, verification_code):
+async def test_failed_user_registration_when_username_are_taken(initialized_app, client, session, test_user, verification_code, verification_code_repository):
     phone = "+375257654322"
 
-    phone_repository = PhoneRepository(session)
-    await phone_repository.update_verification_code_by_phone(phone, verification_code.secret, verification_code.token, verification_code.code)
+    await verification_code_repository.update_verification_code_by_phone(phone, verification_code)
 
     registration_json = {
         "phone": phone,
@@ -75,11 +72,10 @@ async def test_failed_user_registration_when_username_are_taken(initialized_app,
 
 
 @pytest.mark.asyncio
-async def test_failed_user_registration_when_phone_are_taken(initialized_app, client, session, verification_code, test_user):
+async def test_failed_user_registration_when_phone_are_taken(initialized_app, client, session, verification_code, verification_code_repository, test_user):
     phone = "+375257654321"
 
-    phone_repository = PhoneRepository(session)
-    await phone_repository.update_verification_code_by_phone(phone, verification_code.secret, verification_code.token, verification_code.code)
+    await verification_code_repository.update_verification_code_by_phone(phone, verification_code)
 
     registration_json = {
         "phone": phone,
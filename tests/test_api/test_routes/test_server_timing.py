@@ -0,0 +1,44 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+
+from fastapi import status
+from httpx import AsyncClient
+
+from app.services.token import create_tokens_for_user
+
+
+@pytest.mark.asyncio
+async def test_server_timing_is_returned_for_requests_with_key(monkeypatch, settings, authorization_prefix):
+    from app.app import get_application
+
+    monkeypatch.setattr(settings, "server_timing_key", "secret")
+    app = get_application()
+
+    token_access, _ = create_tokens_for_user(5, "username", settings.private_key)
+    headers = {"Authorization": f"{authorization_prefix} {token_access}"}
+
+    async with AsyncClient(app=app, base_url="http://localhost:12345") as client:
+        response = await client.get(app.url_path_for("auth:forward-auth"), headers={"X-Server-Timing": "secret", **headers})
+        assert response.status_code == status.HTTP_200_OK
+
+        untimed_response = await client.get(app.url_path_for("auth:forward-auth"), headers=headers)
+        assert untimed_response.status_code == status.HTTP_200_OK
+        assert "Server-Timing" not in untimed_response.headers
+
+    phases = [phase.split(";")[0] for phase in response.headers["Server-Timing"].split(", ")]
+    assert "jwt" in phases
+    assert "serialize" in phases
+    assert phases[-1] == "total"
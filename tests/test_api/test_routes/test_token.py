@@ -75,3 +75,27 @@ async def test_user_refresh_token(
     )
 
     assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_user_can_not_use_tokens_after_logout(
+        initialized_app: FastAPI,
+        authorized_client: AsyncClient,
+        tokens: (str, str)
+) -> None:
+    token_access, token_refresh = tokens
+
+    response = await authorized_client.post(initialized_app.url_path_for("auth:logout"))
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await authorized_client.get(initialized_app.url_path_for("users:get-current-user"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await authorized_client.post(
+        initialized_app.url_path_for("auth:refresh-token"),
+        json={
+            "token_access": token_access,
+            "token_refresh": token_refresh,
+        },
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
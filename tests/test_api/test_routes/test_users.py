@@ -17,7 +17,6 @@ import pytest
 from fastapi import FastAPI, status
 from httpx import AsyncClient
 
-from app.database.repositories.phone_repository import PhoneRepository
 from app.database.repositories.user_repository import UserRepository
 from app.models.domain.user import User
 from app.models.domain.verification_code import VerificationCode
@@ -102,11 +101,26 @@ async def test_user_can_update_username_on_own_profile(initialized_app, authoriz
 
 
 @pytest.mark.asyncio
-async def test_user_can_update_phone_on_own_profile(initialized_app, authorized_client, session, test_user, verification_code):
+async def test_profile_update_revokes_tokens_with_claims(monkeypatch, settings, initialized_app, authorized_client, test_user):
+    monkeypatch.setattr(settings, "jwt_claims_only", True)
+
+    response = await authorized_client.patch(
+        initialized_app.url_path_for("users:update-current-user"),
+        json={
+            "username": "new_username",
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await authorized_client.get(initialized_app.url_path_for("users:get-current-user"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_user_can_update_phone_on_own_profile(initialized_app, authorized_client, session, test_user, verification_code, verification_code_repository):
     new_phone = "+375257654322"
 
-    phone_repository = PhoneRepository(session)
-    await phone_repository.update_verification_code_by_phone(new_phone, verification_code.secret, verification_code.token, verification_code.code)
+    await verification_code_repository.update_verification_code_by_phone(new_phone, verification_code)
 
     response = await authorized_client.post(
         initialized_app.url_path_for("users:change-phone-for-current-user"),
@@ -162,11 +176,10 @@ async def test_user_can_not_take_already_used_username(initialized_app, authoriz
 
 
 @pytest.mark.asyncio
-async def test_user_can_not_take_already_used_phone(initialized_app, authorized_client, session, test_user, test_other_user, verification_code):
+async def test_user_can_not_take_already_used_phone(initialized_app, authorized_client, session, test_user, test_other_user, verification_code, verification_code_repository):
     phone = "+375257654322"
 
-    phone_repository = PhoneRepository(session)
-    await phone_repository.update_verification_code_by_phone(phone, verification_code.secret, verification_code.token, verification_code.code)
+    await verification_code_repository.update_verification_code_by_phone(phone, verification_code)
 
     response = await authorized_client.post(
         initialized_app.url_path_for("users:change-phone-for-current-user"),
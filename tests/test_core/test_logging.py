@@ -0,0 +1,90 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import logging
+import threading
+
+import orjson
+import pytest
+
+from loguru import logger
+
+from app.core.logging import AccessLogSampler, QueuedSink, configure_logging
+
+
+def create_access_record(status_code: int) -> logging.LogRecord:
+    return logging.LogRecord(
+        "uvicorn.access", logging.INFO, __file__, 0,
+        '%s - "%s %s HTTP/%s" %d', ("127.0.0.1:50000", "POST", "/api/v2/auth/login", "1.1", status_code), None,
+    )
+
+
+def test_access_log_sampler_keeps_errors():
+    sampler = AccessLogSampler(0.0)
+
+    assert not sampler.filter(create_access_record(200))
+    assert sampler.filter(create_access_record(401))
+
+
+@pytest.mark.asyncio
+async def test_queued_json_logs_are_written_by_writer_thread():
+    stream = io.StringIO()
+    configure_logging(logging.INFO, (), json=True, enqueue=True, sink=stream)
+
+    logger.bind(user_id=1).info("User logged in")
+    await logger.complete()
+    logger.remove()
+
+    message = orjson.loads(stream.getvalue())
+    assert message["level"] == "INFO"
+    assert message["message"] == "User logged in"
+    assert message["extra"] == {"user_id": 1}
+    assert message["function"] == "test_queued_json_logs_are_written_by_writer_thread"
+
+
+def test_queued_sink_stops_when_stream_is_closed():
+    stream = io.StringIO()
+    sink = QueuedSink(stream)
+    stream.close()
+
+    sink.stop()
+
+    assert not sink._thread.is_alive()
+
+
+class StalledStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.released = threading.Event()
+
+    def write(self, message: str) -> int:
+        self.released.wait()
+        return super().write(message)
+
+
+def test_full_queue_drops_records_below_warning():
+    stream = StalledStream()
+    sink = QueuedSink(stream, queue_size=1)
+    handler_id = logger.add(sink, format="{message}", colorize=False)
+
+    try:
+        for index in range(5):
+            logger.info(f"Request {index}")
+    finally:
+        stream.released.set()
+        logger.remove(handler_id)
+
+    assert sink.dropped >= 3
+    assert stream.getvalue().count("Request") == 5 - sink.dropped
@@ -0,0 +1,44 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+
+from app.core.metrics import Counter, Histogram, REGISTRY
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_duration_seconds", "Test durations.", ("operation",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "read")
+    histogram.observe(0.1, "read")
+    histogram.observe(5.0, "read")
+
+    lines = histogram.render()
+    REGISTRY.pop(histogram.name)
+
+    worker = f'worker="{os.getpid()}"'
+
+    assert f'test_duration_seconds_bucket{{operation="read",le="0.1",{worker}}} 2' in lines
+    assert f'test_duration_seconds_bucket{{operation="read",le="1.0",{worker}}} 2' in lines
+    assert f'test_duration_seconds_bucket{{operation="read",le="+Inf",{worker}}} 3' in lines
+    assert f'test_duration_seconds_count{{operation="read",{worker}}} 3' in lines
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("test_total", "Test counter.", ("name",))
+    counter.inc('a"b')
+
+    lines = counter.render()
+    REGISTRY.pop(counter.name)
+
+    assert f'test_total{{name="a\\"b",worker="{os.getpid()}"}} 1.0' in lines
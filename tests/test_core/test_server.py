@@ -0,0 +1,76 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import sys
+import threading
+
+from typing import List
+
+from app.core.config import get_app_settings
+from app.core.server import STARTUP_FAILURE, Supervisor, get_cpu_count, get_worker_count
+
+
+def fail_to_start(sockets: List, max_requests: int) -> None:
+    sys.exit(STARTUP_FAILURE)
+
+
+def serve_and_exit(sockets: List, max_requests: int) -> None:
+    pass
+
+
+def test_failed_worker_start_stops_supervisor():
+    supervisor = Supervisor(fail_to_start, [], workers=2, max_requests=0)
+
+    assert supervisor.run() == STARTUP_FAILURE
+    assert supervisor.restarts == 0
+
+
+def test_exited_workers_are_replaced():
+    supervisor = Supervisor(serve_and_exit, [], workers=1, max_requests=100)
+
+    timer = threading.Timer(3.0, supervisor.stop)
+    timer.start()
+
+    try:
+        assert supervisor.run() == 0
+    finally:
+        timer.cancel()
+
+    assert supervisor.restarts > 0
+
+
+def test_single_worker_is_started_without_redis(monkeypatch):
+    settings = get_app_settings()
+    monkeypatch.setattr(settings, "server_workers", 4)
+
+    monkeypatch.setattr(settings, "redis_url", "")
+    assert get_worker_count(settings) == 1
+
+    monkeypatch.setattr(settings, "redis_url", "redis://redis:6379/0")
+    assert get_worker_count(settings) == 4
+
+
+def test_cpu_count_is_capped_by_container_quota(monkeypatch, tmp_path):
+    cpu_max = tmp_path / "cpu.max"
+    monkeypatch.setattr("app.core.server.CGROUP_CPU_MAX", str(cpu_max))
+    monkeypatch.setattr("app.core.server.os.sched_getaffinity", lambda pid: set(range(64)))
+
+    cpu_max.write_text("200000 100000\n")
+    assert get_cpu_count() == 2
+
+    cpu_max.write_text("50000 100000\n")
+    assert get_cpu_count() == 1
+
+    cpu_max.write_text("max 100000\n")
+    assert get_cpu_count() == 64
@@ -0,0 +1,91 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+
+from app.core.tracing import SpanExporter, current_traceparent, parse_traceparent, start_span, start_trace, tracer
+
+
+@pytest.fixture
+def exporter() -> SpanExporter:
+    exporter = SpanExporter()
+    tracer.configure(0.0, exporter)
+
+    yield exporter
+
+    tracer.configure(0.0, None)
+
+
+def test_spans_continue_incoming_trace(exporter: SpanExporter):
+    traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+    with start_trace("auth:login", traceparent, remote=True) as root:
+        assert root is None
+
+    tracer.trust_traceparent = True
+
+    with start_trace("auth:login", traceparent, remote=True) as root:
+        with start_span("jwt.sign"):
+            trace_id, parent_id, sampled = parse_traceparent(current_traceparent())
+
+    child, parent = exporter._spans
+    assert parent is root
+    assert parent.trace_id == child.trace_id == "0af7651916cd43dd8448eb211c80319c"
+    assert parent.parent_id == "b7ad6b7169203331"
+    assert child.parent_id == parent.span_id
+    assert parent_id == child.span_id
+    assert sampled
+
+
+def test_unsampled_requests_record_nothing(exporter: SpanExporter):
+    with start_trace("auth:login") as root:
+        with start_span("jwt.sign") as span:
+            assert root is None and span is None
+
+    with start_trace("auth:login", "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-00") as root:
+        assert root is None
+
+    assert not exporter._spans
+
+
+def test_failed_span_is_marked_as_error(exporter: SpanExporter):
+    tracer.sample_rate = 1.0
+
+    with pytest.raises(ValueError):
+        with start_trace("auth:login"):
+            raise ValueError()
+
+    assert exporter._spans[0].to_dict()["status"]["code"] == "ERROR"
+
+
+def test_remote_traceparent_is_sampled_at_the_configured_rate(exporter: SpanExporter):
+    tracer.sample_rate = 1.0
+
+    with start_trace("auth:login", "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-00", remote=True) as root:
+        assert root.trace_id == "0af7651916cd43dd8448eb211c80319c"
+
+
+def test_full_span_buffer_drops_spans():
+    exporter = SpanExporter(buffer_size=2)
+    tracer.configure(1.0, exporter)
+
+    try:
+        for _ in range(3):
+            with start_trace("auth:login"):
+                pass
+    finally:
+        tracer.configure(0.0, None)
+
+    assert len(exporter._spans) == 2
+    assert exporter.dropped == 1
@@ -0,0 +1,47 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+
+from app.database.key_value_store import MemoryKeyValueStore
+
+
+@pytest.mark.asyncio
+async def test_memory_key_value_store_purges_expired_values_on_set(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("app.database.key_value_store.time", lambda: now)
+
+    store = MemoryKeyValueStore()
+    await store.set("expired", "value", ttl=10)
+    await store.set("deleted", "value", ttl=600)
+    await store.delete("deleted")
+
+    now += MemoryKeyValueStore.PURGE_INTERVAL + 1
+    await store.set("key", "value", ttl=60)
+
+    assert len(store) == 1
+    assert await store.get("key") == "value"
+
+
+@pytest.mark.asyncio
+async def test_memory_key_value_store_expires_values(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("app.database.key_value_store.time", lambda: now)
+
+    store = MemoryKeyValueStore()
+    await store.set("key", "value", ttl=60)
+    assert await store.get("key") == "value"
+
+    now += 60
+    assert await store.get("key") is None
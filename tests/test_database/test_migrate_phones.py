@@ -0,0 +1,59 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from typing import Dict, List
+
+import pytest
+
+from neo4j import AsyncSession
+
+from app.database.migrate_phones import normalize_stored_phones
+from app.database.repositories.phone_repository import PhoneRepository
+
+
+class FakePhoneRepository(object):
+    def __init__(self, numbers: List[str]) -> None:
+        self.numbers = sorted(numbers)
+        self.renamed: Dict[str, str] = {}
+
+    async def get_phone_numbers(self, after: str, limit: int) -> List[str]:
+        return [number for number in self.numbers if number > after][:limit]
+
+    async def rename_phone(self, number: str, new_number: str) -> bool:
+        if new_number in self.numbers:
+            return False
+
+        self.renamed[number] = new_number
+        return True
+
+
+@pytest.mark.asyncio
+async def test_stored_phones_are_rewritten_to_e164():
+    phone_repository = FakePhoneRepository(["+375 25 765-43-21", "+375257654322", "+375 (25) 765-43-22", "invalid"])
+
+    renamed, skipped = await normalize_stored_phones(phone_repository, batch_size=2)
+
+    assert phone_repository.renamed == {"+375 25 765-43-21": "+375257654321"}
+    assert renamed == 1
+    assert skipped == 2
+
+
+@pytest.mark.asyncio
+async def test_phone_is_renamed_in_database(session: AsyncSession):
+    await session.run("CREATE (:Phone {number: '+375 25 000-00-01'})")
+
+    phone_repository = PhoneRepository(session)
+
+    assert await phone_repository.rename_phone("+375 25 000-00-01", "+375250000001")
+    assert not await phone_repository.rename_phone("+375 25 000-00-01", "+375250000001")
@@ -0,0 +1,117 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from loguru import logger
+from neo4j.exceptions import ConstraintError
+
+from app.database.query_executor import QueryExecutor, format_plan, get_db_hits, query_profiler
+from app.database.repositories.user_repository import UserRepository
+
+
+class FakeResult(object):
+    def __init__(self, records: List[dict]) -> None:
+        self._records = records
+
+    async def __aiter__(self):
+        for record in self._records:
+            yield record
+
+    async def consume(self) -> SimpleNamespace:
+        return SimpleNamespace(query_type="r")
+
+
+class FailingResult(FakeResult):
+    async def __aiter__(self):
+        raise ConstraintError("Node already exists with label `User` and property `username`")
+        yield
+
+
+class FakeSession(object):
+    def __init__(self, records: List[dict]) -> None:
+        self.records = records
+
+    async def run(self, query: str, **parameters) -> FakeResult:
+        return FakeResult(self.records)
+
+
+class FailingSession(object):
+    async def run(self, query: str, **parameters) -> FakeResult:
+        return FailingResult([])
+
+
+@pytest.fixture
+def warnings() -> List[str]:
+    messages: List[str] = []
+    handler_id = logger.add(messages.append, level="WARNING", format="{message}")
+
+    yield messages
+
+    logger.remove(handler_id)
+    query_profiler.configure(0.25, 0.0, None)
+
+
+@pytest.mark.asyncio
+async def test_results_are_buffered(warnings: List[str]):
+    executor = QueryExecutor(FakeSession([{"id": 1}, {"id": 2}]), "UserRepository")
+
+    result = await executor.run("MATCH (user:User) RETURN user", username="user")
+
+    assert [record async for record in result] == [{"id": 1}, {"id": 2}]
+    assert await result.single() == {"id": 1}
+    assert not warnings
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_without_values(warnings: List[str]):
+    query_profiler.configure(0.0, 0.0, None)
+    executor = QueryExecutor(FakeSession([]), "UserRepository")
+
+    async def get_user_by_username():
+        return await executor.run("MATCH (user:User {username: $username}) RETURN user", username="secret")
+
+    result = await get_user_by_username()
+
+    assert await result.single() is None
+    assert len(warnings) == 1
+    assert "UserRepository.get_user_by_username" in warnings[0]
+    assert "username:str" in warnings[0]
+    assert "secret" not in warnings[0]
+
+
+@pytest.mark.asyncio
+async def test_errors_while_reading_records_reach_the_repository(warnings: List[str]):
+    user_repository = UserRepository(FailingSession())
+
+    user = await user_repository.create_user(phone="+375257654321", username="username", password="password")
+
+    assert user is None
+
+
+def test_profile_plan_is_summarized():
+    plan = {
+        "operatorType": "ProduceResults",
+        "rows": 1,
+        "dbHits": 0,
+        "children": [
+            {"operatorType": "NodeIndexSeek", "rows": 1, "dbHits": 2, "children": []},
+        ],
+    }
+
+    assert get_db_hits(plan) == 2
+    assert format_plan(plan) == "ProduceResults(rows=1, dbHits=0) <- NodeIndexSeek(rows=1, dbHits=2)"
@@ -0,0 +1,29 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from app.resources import strings_factory
+from app.resources.strings_en import StringsEN
+from app.resources.strings_ru import StringsRU
+
+
+def test_language_is_negotiated_by_quality():
+    assert isinstance(strings_factory.get_language("ru-RU,ru;q=0.9,en-US;q=0.8"), StringsRU)
+    assert isinstance(strings_factory.get_language("en;q=0.5, ru;q=0.7"), StringsRU)
+    assert type(strings_factory.get_language("ru;q=0, en")) is StringsEN
+    assert type(strings_factory.get_language("de, *")) is StringsEN
+    assert type(strings_factory.get_language("")) is StringsEN
+
+
+def test_language_catalog_is_shared_between_calls():
+    assert strings_factory.get_language("ru") is strings_factory.get_language("ru-BY")
@@ -0,0 +1,52 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitState
+
+
+def test_circuit_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60.0)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.closed
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.open
+    assert not breaker.allow()
+
+
+def test_half_open_circuit_lets_one_probe_through():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.0)
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.half_open
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.closed
+    assert breaker.allow()
+
+
+def test_failed_probe_opens_circuit_again():
+    breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=60.0)
+    breaker._state = CircuitState.half_open
+
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.open
+    assert breaker.opened == 1
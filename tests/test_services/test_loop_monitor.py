@@ -0,0 +1,48 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import asyncio
+import time
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.loop_monitor import LoopMonitor, _get_function_name
+
+
+def block_loop() -> None:
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_attributed():
+    monitor = LoopMonitor(interval=0.01, threshold=0.05)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+
+    block_loop()
+    await asyncio.sleep(0.05)
+
+    task.cancel()
+
+    assert monitor.blocks == 1
+    assert monitor.last_stack[-1].startswith("tests.test_services.test_loop_monitor.block_loop:")
+    assert "tests.test_services.test_loop_monitor.test_blocking_call_is_attributed" in monitor.last_stack[-2]
+
+
+def test_function_name_falls_back_to_code_name():
+    frame = SimpleNamespace(f_globals={"__name__": "app.module"}, f_code=SimpleNamespace(co_name="handler"))
+
+    assert _get_function_name(frame) == "app.module.handler"
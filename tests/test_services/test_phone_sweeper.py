@@ -0,0 +1,100 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from time import time
+from typing import List
+
+import pytest
+
+from neo4j import AsyncSession
+
+from app.database.repositories.lock_repository import LockRepository
+from app.database.repositories.phone_repository import PhoneRepository
+from app.services.phone_sweeper import PhoneSweeper
+
+
+class FakeLockRepository(object):
+    def __init__(self, acquired: List[bool]) -> None:
+        self.acquired = acquired
+        self.calls = 0
+
+    async def acquire_lock(self, name: str, owner: str, now: int, ttl: int) -> bool:
+        self.calls += 1
+        return self.acquired.pop(0)
+
+
+def create_sweep_batch(counts: List[int]):
+    async def sweep_batch(now: int, limit: int) -> int:
+        return counts.pop(0)
+
+    return sweep_batch
+
+
+@pytest.mark.asyncio
+async def test_sweeper_runs_batches_until_a_short_one():
+    sweeper = PhoneSweeper(None, interval=60.0, batch_size=2, batch_pause=0.0)
+    lock_repository = FakeLockRepository([True, True])
+
+    total = await sweeper._sweep_batches(create_sweep_batch([2, 2, 1]), lock_repository)
+
+    assert total == 5
+    assert lock_repository.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_sweeper_stops_when_lock_is_lost():
+    sweeper = PhoneSweeper(None, interval=60.0, batch_size=2, batch_pause=0.0)
+    lock_repository = FakeLockRepository([False])
+
+    total = await sweeper._sweep_batches(create_sweep_batch([2, 2, 1]), lock_repository)
+
+    assert total == 2
+    assert lock_repository.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_lock_is_held_by_one_owner_until_it_expires(session: AsyncSession):
+    lock_repository = LockRepository(session)
+    now = int(time())
+
+    assert await lock_repository.acquire_lock("test_lock", "first", now, 10)
+    assert await lock_repository.acquire_lock("test_lock", "first", now + 5, 10)
+    assert not await lock_repository.acquire_lock("test_lock", "second", now + 5, 10)
+    assert await lock_repository.acquire_lock("test_lock", "second", now + 16, 10)
+    assert not await lock_repository.acquire_lock("test_lock", "first", now + 17, 10)
+
+
+@pytest.mark.asyncio
+async def test_sweep_queries_skip_phones_with_pending_verification(session: AsyncSession):
+    now = int(time())
+    query = """
+        CREATE (:Phone {number: "+375250000001", verification_expires_at: $expired})
+        CREATE (:Phone {number: "+375250000002", verification_expires_at: $pending})
+        CREATE (:Phone {number: "+375250000003", secret: "secret", verification_expires_at: $expired})-[:Attached]->(:User)
+    """
+    await session.run(query, expired=now - 1, pending=now + 60)
+
+    phone_repository = PhoneRepository(session)
+
+    assert await phone_repository.delete_unattached_phones(now, 1000000) >= 1
+    assert await phone_repository.clear_verification_by_attached_phones(now, 1000000) >= 1
+
+    result = await session.run("""
+        MATCH (phone:Phone)
+        WHERE phone.number IN ["+375250000001", "+375250000002", "+375250000003"]
+        RETURN phone.number AS number, phone.secret AS secret
+    """)
+    phones = {record["number"]: record["secret"] async for record in result}
+
+    assert phones == {"+375250000002": None, "+375250000003": None}
@@ -0,0 +1,88 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+
+from app.services.rate_limit import (
+    LoginLimiter,
+    MemoryRateLimitStore,
+    RateLimitStore,
+    RateLimitStoreUnavailable,
+    RedisRateLimitStore,
+    SlidingWindowLimiter,
+    VerificationCodeLimiter,
+)
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_limiter_rejects_hits_over_limit(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("app.services.rate_limit.time", lambda: now)
+
+    limiter = SlidingWindowLimiter("test", limit=2, window=60, store=MemoryRateLimitStore())
+
+    assert not await limiter.acquire("key")
+    assert not await limiter.acquire("key")
+    assert await limiter.acquire("key") == 60
+    assert not await limiter.acquire("other_key")
+
+    now += 30
+    assert await limiter.acquire("key") == 30
+
+    now += 30
+    assert not await limiter.acquire("key")
+
+    assert limiter.allowed == 4
+    assert limiter.rejected == 2
+
+
+@pytest.mark.asyncio
+async def test_login_limiter_limits_username_and_host():
+    limiter = LoginLimiter(attempts_per_username=1, attempts_per_host=2, window=60, store=MemoryRateLimitStore())
+
+    assert not await limiter.acquire("username", "127.0.0.1")
+    assert await limiter.acquire("username", "127.0.0.2")
+    assert not await limiter.acquire("other_username", "127.0.0.1")
+    assert await limiter.acquire("third_username", "127.0.0.1")
+
+
+class UnavailableRateLimitStore(RateLimitStore):
+    async def acquire(self, key: str, limit: int, window: float, now: float) -> float:
+        raise RateLimitStoreUnavailable()
+
+
+@pytest.mark.asyncio
+async def test_login_limiter_fails_open_without_store():
+    limiter = LoginLimiter(attempts_per_username=1, attempts_per_host=1, window=60, store=UnavailableRateLimitStore())
+
+    assert not await limiter.acquire("username", "127.0.0.1")
+    assert not await limiter.acquire("username", "127.0.0.1")
+
+
+@pytest.mark.asyncio
+async def test_verification_code_limiter_fails_closed_without_store():
+    limiter = VerificationCodeLimiter(resend_timeout=60, codes_per_day=10, store=UnavailableRateLimitStore())
+
+    with pytest.raises(RateLimitStoreUnavailable):
+        await limiter.acquire("+375257654321")
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_make_the_store_unavailable():
+    pytest.importorskip("redis")
+
+    store = RedisRateLimitStore("redis://127.0.0.1:1/0")
+
+    with pytest.raises(RateLimitStoreUnavailable):
+        await store.acquire("key", 1, 60, 1000.0)
@@ -0,0 +1,66 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from time import time
+
+from app.core.settings.app import AppSettings
+from app.services.revocation import RevocationList
+from app.services.token import create_tokens_for_user, get_access_token_payload
+
+
+def test_revoked_token_id_expires_with_token():
+    revocation_list = RevocationList(ttl=300)
+    revocation_list.revoke_token("token", time() + 300)
+    revocation_list.revoke_token("expired_token", time() - 1)
+
+    assert revocation_list.is_revoked(1, int(time()), "token")
+    assert not revocation_list.is_revoked(1, int(time()), "other_token")
+    assert not revocation_list.is_revoked(1, int(time()), "expired_token")
+
+
+def test_revoked_user_keeps_tokens_issued_after_revocation():
+    revocation_list = RevocationList(ttl=300)
+    revoked_at = int(time() * 1000000)
+    revocation_list.revoke_user(1, revoked_at)
+
+    assert revocation_list.is_revoked(1, revoked_at - 1)
+    assert not revocation_list.is_revoked(1, revoked_at)
+    assert not revocation_list.is_revoked(2, revoked_at - 1)
+
+
+def test_expired_revocations_are_purged():
+    revocation_list = RevocationList(ttl=300)
+    revocation_list.revoke_user(1, int((time() - 600) * 1000000))
+    revocation_list.revoke_token("token", time() - 1)
+
+    assert not revocation_list.is_revoked(1, int((time() - 700) * 1000000))
+
+    revocation_list.revoke_token("other_token", time() + 300)
+    assert len(revocation_list) == 1
+
+
+def test_revocation_orders_tokens_within_the_same_second(settings: AppSettings):
+    revocation_list = RevocationList(ttl=300)
+
+    token_access, _ = create_tokens_for_user(1, "username", settings.private_key)
+    revoked = get_access_token_payload(token_access, settings.public_key)
+
+    revocation_list.revoke_user(1)
+
+    token_access, _ = create_tokens_for_user(1, "username", settings.private_key)
+    issued = get_access_token_payload(token_access, settings.public_key)
+
+    assert revoked.iat == issued.iat or revoked.iat + 1 == issued.iat
+    assert revocation_list.is_revoked(1, revoked.issued_at, revoked.jti)
+    assert not revocation_list.is_revoked(1, issued.issued_at, issued.jti)
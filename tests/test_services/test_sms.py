@@ -0,0 +1,53 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+
+from httpx import AsyncClient, ConnectTimeout, MockTransport, Request, Response
+
+from app.services.sms import SmsResult, send_verify_code_to_phone
+
+
+@pytest.mark.asyncio
+async def test_send_verify_code_reuses_client():
+    requests = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(200)
+
+    async with AsyncClient(base_url="http://sms/api/v1", transport=MockTransport(handler)) as client:
+        assert await send_verify_code_to_phone(client, "+375257654321", "1") == SmsResult.delivered
+        assert await send_verify_code_to_phone(client, "+375257654321", "2") == SmsResult.delivered
+
+    assert [request.url.path for request in requests] == ["/api/v1/send", "/api/v1/send"]
+
+
+@pytest.mark.asyncio
+async def test_send_verify_code_fails_on_timeout():
+    def handler(request: Request) -> Response:
+        raise ConnectTimeout("timeout", request=request)
+
+    async with AsyncClient(base_url="http://sms/api/v1", transport=MockTransport(handler)) as client:
+        assert await send_verify_code_to_phone(client, "+375257654321", "1") == SmsResult.failed
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code, result", [(400, SmsResult.rejected), (422, SmsResult.rejected), (500, SmsResult.failed), (503, SmsResult.failed)])
+async def test_send_verify_code_tells_rejections_from_failures(status_code, result):
+    def handler(request: Request) -> Response:
+        return Response(status_code)
+
+    async with AsyncClient(base_url="http://sms/api/v1", transport=MockTransport(handler)) as client:
+        assert await send_verify_code_to_phone(client, "+375257654321", "1") == result
@@ -0,0 +1,203 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import asyncio
+
+import pytest
+
+from httpx import AsyncClient, MockTransport, Request, Response
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitState
+from app.services.sms import SmsResult
+from app.services.sms_outbox import SmsOutbox
+
+
+def create_outbox(client: AsyncClient, batch_size: int) -> SmsOutbox:
+    breaker = CircuitBreaker("sms_service", failure_threshold=5, recovery_timeout=30.0)
+    return SmsOutbox(None, client, breaker, deadline=10.0, workers=1, batch_size=batch_size, poll_interval=1.0, lease=30.0, retry_base=1.0, retry_max=60.0)
+
+
+messages = [
+    {"key": "first", "phone": "+375257654321", "message": "1", "traceparent": ""},
+    {"key": "second", "phone": "+375257654322", "message": "2", "traceparent": ""},
+]
+
+
+@pytest.mark.asyncio
+async def test_messages_are_batched_into_one_call():
+    paths = []
+
+    def handler(request: Request) -> Response:
+        paths.append(request.url.path)
+        return Response(200)
+
+    async with AsyncClient(base_url="http://sms/api/v1", transport=MockTransport(handler)) as client:
+        results = await create_outbox(client, batch_size=10)._send(messages)
+
+    assert results == {"first": SmsResult.delivered, "second": SmsResult.delivered}
+    assert paths == ["/api/v1/send_batch"]
+
+
+@pytest.mark.asyncio
+async def test_messages_are_sent_one_by_one_without_batching():
+    def handler(request: Request) -> Response:
+        return Response(200 if b"+375257654321" in request.content else 500)
+
+    async with AsyncClient(base_url="http://sms/api/v1", transport=MockTransport(handler)) as client:
+        results = await create_outbox(client, batch_size=1)._send(messages)
+
+    assert results == {"first": SmsResult.delivered, "second": SmsResult.failed}
+
+
+@pytest.mark.asyncio
+async def test_slow_sms_service_counts_as_failure():
+    async def handler(request: Request) -> Response:
+        await asyncio.sleep(1)
+        return Response(200)
+
+    async with AsyncClient(base_url="http://sms/api/v1", transport=MockTransport(handler)) as client:
+        outbox = create_outbox(client, batch_size=1)
+        outbox._deadline = 0.01
+
+        results = await outbox._send(messages[:1])
+
+    assert results == {"first": SmsResult.failed}
+    assert outbox.breaker.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_messages_do_not_trip_the_breaker():
+    def handler(request: Request) -> Response:
+        return Response(400)
+
+    async with AsyncClient(base_url="http://sms/api/v1", transport=MockTransport(handler)) as client:
+        outbox = create_outbox(client, batch_size=1)
+
+        for _ in range(10):
+            results = await outbox._send(messages[:1])
+
+    assert results == {"first": SmsResult.rejected}
+    assert outbox.breaker.failures == 0
+    assert outbox.breaker.allow()
+
+
+class FakeSession(object):
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
+class FakeDriver(object):
+    def session(self) -> FakeSession:
+        return FakeSession()
+
+
+class FakeSmsOutboxRepository(object):
+    def __init__(self) -> None:
+        self.retried = []
+        self.deleted = []
+
+    async def claim_messages(self, now: float, lease: float, limit: int) -> list:
+        return [dict(message, attempts=0, created_at=now) for message in messages]
+
+    async def retry_message(self, key: str, attempts: int, next_attempt_at: float) -> None:
+        self.retried.append(key)
+
+    async def delete_messages(self, keys: list) -> None:
+        self.deleted.extend(keys)
+
+
+@pytest.mark.asyncio
+async def test_rejected_messages_are_dropped_and_failed_ones_retried(monkeypatch):
+    repository = FakeSmsOutboxRepository()
+    monkeypatch.setattr("app.services.sms_outbox.SmsOutboxRepository", lambda session: repository)
+
+    def handler(request: Request) -> Response:
+        return Response(400 if b"+375257654321" in request.content else 503)
+
+    async with AsyncClient(base_url="http://sms/api/v1", transport=MockTransport(handler)) as client:
+        outbox = create_outbox(client, batch_size=1)
+        outbox._driver = FakeDriver()
+
+        assert await outbox.deliver() == 2
+
+    assert repository.deleted == ["first"]
+    assert repository.retried == ["second"]
+    assert outbox.rejected == 1
+    assert outbox.retried == 1
+    assert outbox.breaker.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_unexpected_send_error_counts_as_failure(monkeypatch):
+    repository = FakeSmsOutboxRepository()
+    monkeypatch.setattr("app.services.sms_outbox.SmsOutboxRepository", lambda session: repository)
+
+    def handler(request: Request) -> Response:
+        raise RuntimeError("broken transport")
+
+    async with AsyncClient(base_url="http://sms/api/v1", transport=MockTransport(handler)) as client:
+        outbox = create_outbox(client, batch_size=1)
+        outbox._driver = FakeDriver()
+        outbox.breaker._state = CircuitState.half_open
+
+        assert await outbox.deliver() == 2
+
+    assert repository.retried == ["first", "second"]
+    assert outbox.breaker.state == CircuitState.open
+
+
+@pytest.mark.asyncio
+async def test_probe_is_released_when_delivery_raises(monkeypatch):
+    class BrokenSmsOutboxRepository(FakeSmsOutboxRepository):
+        async def claim_messages(self, now: float, lease: float, limit: int) -> list:
+            raise RuntimeError("broken repository")
+
+    monkeypatch.setattr("app.services.sms_outbox.SmsOutboxRepository", lambda session: BrokenSmsOutboxRepository())
+
+    outbox = create_outbox(None, batch_size=1)
+    outbox._driver = FakeDriver()
+    outbox.breaker._state = CircuitState.half_open
+
+    with pytest.raises(RuntimeError):
+        await outbox.deliver()
+
+    assert outbox.breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_unexpected_errors():
+    calls = []
+
+    async def deliver() -> int:
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("unexpected")
+
+        return 0
+
+    outbox = create_outbox(None, batch_size=1)
+    outbox._poll_interval = 0.01
+    outbox.deliver = deliver
+
+    worker = asyncio.create_task(outbox._work())
+    await asyncio.sleep(0.1)
+    worker.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await worker
+
+    assert len(calls) > 1
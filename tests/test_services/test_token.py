@@ -0,0 +1,54 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.core.settings.app import AppSettings
+from app.services.revocation import revocation_list
+from app.services.token import access_token_cache, create_tokens_for_user, get_access_token_payload
+
+
+def test_access_token_is_verified_once(settings: AppSettings):
+    token_access, _ = create_tokens_for_user(1, "username", settings.private_key)
+    access_token_cache.clear()
+
+    hits = access_token_cache.hits
+    first = get_access_token_payload(token_access, settings.public_key)
+    second = get_access_token_payload(token_access, settings.public_key)
+
+    assert first is second
+    assert access_token_cache.hits == hits + 1
+
+
+def test_access_token_cache_is_cleared_on_key_rotation(settings: AppSettings):
+    token_access, _ = create_tokens_for_user(1, "username", settings.private_key)
+    rotated_key = rsa.generate_private_key(public_exponent=65537, key_size=2048).public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+
+    assert get_access_token_payload(token_access, settings.public_key)
+    assert not get_access_token_payload(token_access, rotated_key)
+    assert not len(access_token_cache)
+
+
+def test_access_token_cache_is_evicted_on_revocation(settings: AppSettings):
+    token_access, _ = create_tokens_for_user(2, "username", settings.private_key)
+
+    assert get_access_token_payload(token_access, settings.public_key)
+    assert len(access_token_cache)
+
+    revocation_list.revoke_user(2)
+
+    assert not len(access_token_cache)
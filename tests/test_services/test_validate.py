@@ -0,0 +1,43 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from app.services.validate import ThrottledLogger, check_phone_is_valid, normalize_phone
+
+
+def test_phone_is_normalized_to_e164():
+    assert normalize_phone("+375 25 765-43-21") == "+375257654321"
+    assert normalize_phone("+375257654321") == "+375257654321"
+    assert normalize_phone("+375 (25) 765 43 21") == "+375257654321"
+
+
+def test_invalid_phone_is_not_normalized():
+    assert normalize_phone("phone") is None
+    assert normalize_phone("+3752576543") is None
+    assert not check_phone_is_valid("+3752576543")
+
+
+def test_throttled_logger_suppresses_repeated_messages():
+    throttled_logger = ThrottledLogger(interval=60.0)
+
+    throttled_logger.warning("first")
+    throttled_logger.warning("second")
+    throttled_logger.warning("third")
+
+    assert throttled_logger._suppressed == 2
+
+
+def test_phone_outside_of_regions_is_rejected():
+    assert normalize_phone("+375 25 765-43-21", ("BY", "RU")) == "+375257654321"
+    assert normalize_phone("+4915123456789", ("BY", "RU")) is None
+    assert normalize_phone("+77012345678", ("BY", "RU")) is None
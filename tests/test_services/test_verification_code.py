@@ -0,0 +1,88 @@
+#  Copyright 2022 Pavel Suprunov
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import asyncio
+import pytest
+
+from app.database.key_value_store import MemoryKeyValueStore
+from app.database.repositories.verification_code_repository import VerificationCodeRepository
+from app.services.lock import KeyedLock
+from app.services.rate_limit import MemoryRateLimitStore, VerificationCodeLimiter
+from app.services.verification_code import check_verification_code, create_verification_code
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_generation():
+    lock = KeyedLock()
+    codes = {}
+    generations = []
+
+    async def get_code(phone: str) -> str:
+        async with lock(phone):
+            if phone not in codes:
+                await asyncio.sleep(0.01)
+                generations.append(phone)
+                codes[phone] = f"code-{len(generations)}"
+
+            return codes[phone]
+
+    results = await asyncio.gather(*(get_code("+375257654321") for _ in range(10)), get_code("+375257654322"))
+
+    assert set(results[:10]) == {"code-1"}
+    assert sorted(generations) == ["+375257654321", "+375257654322"]
+    assert not len(lock)
+
+
+@pytest.mark.asyncio
+async def test_verification_code_limiter_applies_cooldown_and_daily_cap(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("app.services.rate_limit.time", lambda: now)
+
+    limiter = VerificationCodeLimiter(resend_timeout=60, codes_per_day=2, store=MemoryRateLimitStore())
+
+    assert not await limiter.acquire("+375257654321")
+    assert await limiter.acquire("+375257654321") == 60
+
+    now += 60
+    assert not await limiter.acquire("+375257654321")
+
+    now += 60
+    assert await limiter.acquire("+375257654321") == 86400 - 120
+
+
+def test_verification_code_is_checked_until_it_expires(monkeypatch):
+    verification_code = create_verification_code(60)
+
+    assert len(verification_code.code) == 6
+    assert verification_code.expires_at == verification_code.issued_at + 60
+    assert check_verification_code(verification_code, verification_code.token, verification_code.code)
+    assert not check_verification_code(verification_code, verification_code.token, "wrong")
+    assert not check_verification_code(verification_code, "wrong", verification_code.code)
+
+    monkeypatch.setattr("app.services.verification_code.time", lambda: verification_code.expires_at)
+    assert not check_verification_code(verification_code, verification_code.token, verification_code.code)
+
+
+@pytest.mark.asyncio
+async def test_verification_code_is_stored_until_it_expires(monkeypatch):
+    verification_code_repository = VerificationCodeRepository(MemoryKeyValueStore())
+    verification_code = create_verification_code(60)
+
+    await verification_code_repository.update_verification_code_by_phone("+375257654321", verification_code)
+    assert await verification_code_repository.get_verification_code_by_phone("+375257654321") == verification_code
+    assert not await verification_code_repository.get_verification_code_by_phone("+375257654322")
+
+    monkeypatch.setattr("app.database.key_value_store.time", lambda: verification_code.expires_at + 1)
+    assert not await verification_code_repository.get_verification_code_by_phone("+375257654321")
+    assert not len(verification_code_repository.store)